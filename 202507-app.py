@@ -1,9 +1,14 @@
+import hashlib
+import importlib
+import threading
+
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from datetime import datetime, timedelta
 
+# --- 修改：啟動時只載入不依賴第三方套件的選項常數；numpy / pandas / plotly 與 gantt_core 的
+# 處理模組延後到使用者上傳檔案後才載入，讓「請在左側側邊欄上傳」的首個畫面更快出現 ---
+from gantt_core import COLUMNAR_FORMATS, ENGINE_ARROW, ENGINE_PANDAS, HAS_PYARROW
+
 # --- 頁面基本設定 ---
 st.set_page_config(
     page_title="專案管理甘特圖",
@@ -15,195 +20,278 @@ st.title("📊 互動式專案管理甘特圖")
 # --- 修改：更新說明文字 ---
 st.write("上傳您的專案管理 CSV 檔案，即可生成互動式甘特圖。可選欄位 `Status` (填入 Closed/In process/Not start) 來追蹤專案進度。")
 
+# --- 新增：上傳檔案快取設定 ---
+CACHE_MAX_ENTRIES = 8         # 最多保留幾份已處理的檔案
+CACHE_TTL_SECONDS = 60 * 60   # 快取存活時間 (秒)，逾時即淘汰
+
+# --- 新增：篩選結果快取的記憶體上限 (每個連線) ---
+FILTER_CACHE_MAX_BYTES = 256 * 1024 ** 2
+
+# --- 新增：細節層級 (LOD) 設定，縮小檢視時將任務收合為每個專案一列 ---
+LOD_VIEW_MODES = ("每年", "每半年")
+LOD_ROW_THRESHOLD = 2_000     # 篩選後超過此列數時啟用彙總檢視
+
+# --- 新增：可見範圍 (viewport) 設定，只傳送與可見日期範圍相交的任務 ---
+VIEWPORT_ROW_THRESHOLD = 10_000  # 篩選後超過此列數時，預設開啟可見範圍模式
+VIEWPORT_DEFAULT_DAYS = 90       # 預設可見範圍：今天前後各 90 天
+
+# --- 新增：任務軸分頁設定，每次只繪製固定數量的任務列 ---
+TASK_PAGE_SIZE = 200          # 每頁預設顯示的任務列數
+
+# --- 新增：圖表快取的記憶體上限 (每個連線) ---
+FIGURE_CACHE_MAX_BYTES = 128 * 1024 ** 2
+
+# --- 新增：狀態分類快取的記憶體上限 (每個連線) ---
+STATUS_CACHE_MAX_BYTES = 32 * 1024 ** 2
+
+# --- 新增：等待上傳時在背景執行緒預先載入的模組 (設為 False 則上傳後才同步載入) ---
+PRELOAD_IN_BACKGROUND = True
+PRELOAD_MODULES = ("pandas", "gantt_core.ingest", "gantt_core.filters", "gantt_core.figure", "gantt_core.status")
+
 # --- 函式定義 ---
 
-def preprocess_data(df):
+def preload_modules():
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+
+@st.cache_resource(show_spinner=False)
+def start_background_preload():
     """
-    資料預處理：轉換日期格式、建立排序鍵、處理狀態欄位。
+    在背景執行緒預先匯入處理資料所需的模組，與使用者挑選檔案的時間重疊；每個行程只啟動一次。
+    上傳後主執行緒的 import 直接取用已載入的模組，若預載尚未完成則等待其完成。
     """
-    # 轉換日期格式
-    for col in ['Start', 'Finish', 'Completion_Date']:
-        if col in df.columns:
-            df[col] = pd.to_datetime(df[col], errors='coerce')
-
-    # --- 新增：處理 Status 欄位 ---
-    if 'Status' in df.columns:
-        # 將空白的狀態值填補為'未定義'
-        df['Status'] = df['Status'].fillna('未定義')
-    else:
-        # 如果沒有 Status 欄位，則新增一個並全部設為'未定義'
-        df['Status'] = '未定義'
-
-    # 建立排序邏輯
-    type_order = {'母專案': 1, '子專案': 2, '里程碑': 3}
-    df['TypeOrder'] = df['Type'].map(type_order).fillna(4)
-
-    # 排序
-    df = df.sort_values(by=['Project', 'TypeOrder', 'Start'], ascending=[True, True, True]).reset_index(drop=True)
-
-    # 將任務名稱設定為 Categorical
-    df['Task'] = pd.Categorical(df['Task'], categories=df['Task'].unique(), ordered=True)
-    
+    thread = threading.Thread(target=preload_modules, name="gantt-preload", daemon=True)
+    thread.start()
+    return thread
+
+# cache_resource 直接回傳同一個物件，不像 cache_data 每次命中都反序列化出新副本；
+# 回傳的資料集視為唯讀，後續的篩選與繪圖都不得修改它。
+@st.cache_resource(max_entries=CACHE_MAX_ENTRIES, ttl=CACHE_TTL_SECONDS, show_spinner="正在解析 CSV 檔案...")
+def load_and_preprocess(file_hash, engine, file_format, _file_bytes):
+    """
+    以上傳檔案內容的雜湊值作為快取鍵：讀取檔案並完成預處理 (gantt_core.load_tasks)。
+    檔案未變動時，互動造成的重新執行會直接取回已處理的資料，不再重新解析。
+    以 pandas 分塊讀取 CSV 時顯示讀取進度。
+    """
+    progress_bar = None
+
+    def show_progress(frac):
+        nonlocal progress_bar
+        if progress_bar is None:
+            progress_bar = st.progress(0.0, text="正在讀取 CSV 檔案...")
+        progress_bar.progress(frac, text=f"正在讀取 CSV 檔案... {frac:.0%}")
+
+    df = load_tasks(_file_bytes, engine, file_format, progress_callback=show_progress)
+    if progress_bar is not None:
+        progress_bar.empty()
     return df
 
-def get_dynamic_tick_format(df, view_mode):
+def get_session_dataset(uploaded_file, engine):
     """
-    根據時間視野動態生成X軸的刻度位置與標籤
+    取得本次連線的預處理資料集 (唯讀)，存放於 st.session_state。
+    同一個上傳檔案與解析引擎只在第一次計算內容雜湊、載入並建立專案/類型索引，
+    之後的重新執行直接沿用。
     """
-    valid_starts = df['Start'].dropna()
-    valid_finishes = df['Finish'].dropna()
-    
-    if valid_starts.empty or valid_finishes.empty:
-        return None, None
-
-    date_min = valid_starts.min()
-    date_max = valid_finishes.max()
-    tickvals, ticktext = [], []
-
-    if view_mode == "每年":
-        years = pd.date_range(start=date_min.to_period('Y').to_timestamp(), end=date_max, freq='YS')
-        tickvals, ticktext = years, [d.strftime('%Y') for d in years]
-    elif view_mode == "每半年":
-        half_years = pd.date_range(start=date_min, end=date_max, freq='6MS')
-        tickvals = half_years
-        ticktext = [f"{d.year}-H{1 if d.month <= 6 else 2}" for d in half_years]
-    elif view_mode == "每季":
-        quarters = pd.date_range(start=date_min, end=date_max, freq='QS')
-        tickvals, ticktext = quarters, [f"{d.year}-Q{d.quarter}" for d in quarters]
-    elif view_mode == "每周":
-        mondays = pd.date_range(start=date_min - pd.to_timedelta(date_min.weekday(), unit='d'), end=date_max, freq='W-MON')
-        tickvals, ticktext = mondays, [d.strftime('%Y-%m-%d') for d in mondays]
-
-    if len(tickvals) == 0:
-        return None, None
-    return tickvals, ticktext
-
-# --- 修改：函式簽名，增加 color_mode 參數 ---
-def create_gantt_chart(df, view_mode, color_mode):
+    dataset_key = (uploaded_file.file_id, engine)
+    dataset = st.session_state.get('dataset')
+    if dataset is None or dataset['key'] != dataset_key:
+        file_bytes = uploaded_file.getvalue()
+        file_hash = hashlib.sha256(file_bytes).hexdigest()
+        file_format = file_format_for(uploaded_file.name)
+        df = load_and_preprocess(file_hash, engine, file_format, file_bytes)
+        dataset = {
+            'key': dataset_key,
+            # 資料集指紋：內容雜湊加上解析引擎，作為下游各快取的鍵
+            'fingerprint': (file_hash, engine),
+            'df': df,
+            'index': build_project_type_index(df),
+        }
+        st.session_state['dataset'] = dataset
+    return dataset
+
+def get_session_cache(name, max_bytes, size_of):
+    """取得 (必要時建立) 存放於 st.session_state 的具名 LRU 快取。"""
+    cache = st.session_state.get(name)
+    if cache is None:
+        cache = LRUCache(max_bytes, size_of)
+        st.session_state[name] = cache
+    return cache
+
+def filter_view_key(dataset, filter_mode, selected_projects=()):
+    """篩選結果的識別鍵：(資料集指紋, 篩選模式, 排序後的所選專案)。"""
+    return (dataset['fingerprint'], filter_mode, tuple(sorted(selected_projects)))
+
+def get_filtered_view(dataset, filter_mode, selected_projects=()):
     """
-    生成甘特圖，並可根據專案或進度狀態來區分顏色。
+    依篩選條件取得資料子集。結果以 filter_view_key 為鍵存入本連線的 LRU 快取，
+    來回切換相同的篩選條件時直接取回先前的結果，總量以 FILTER_CACHE_MAX_BYTES 為上限。
     """
-    if df.empty:
-        st.warning("篩選後無資料可顯示。")
-        return go.Figure()
-
-    tasks_df = df[df['Type'] != '里程碑'].copy()
-    milestones_df = df[df['Type'] == '里程碑'].copy()
-    
-    # --- 新增：定義進度狀態的顏色 ---
-    status_color_map = {
-        'Closed': 'rgb(76, 175, 80)',      # 綠色
-        'In process': 'rgb(255, 152, 0)',  # 橘色
-        'Not start': 'rgb(189, 189, 189)', # 灰色
-        '未定義': 'rgb(158, 158, 158)'       # 深灰色
-    }
-
-    # --- 修改：根據 color_mode 決定 timeline 的顏色參數 ---
-    if color_mode == '依進度狀態區分顏色':
-        color_arg = 'Status'
-        color_map_arg = status_color_map
-    else: # 預設依專案區分顏色
-        color_arg = 'Project'
-        color_map_arg = None
-
-    fig = px.timeline(
-        tasks_df, x_start="Start", x_end="Finish", y="Task",
-        color=color_arg,
-        color_discrete_map=color_map_arg,
-        hover_name="Task",
-        custom_data=['Project', 'Status'], # 加入自訂資料以供懸停提示使用
-        title="專案時程甘特圖"
+    if filter_mode == "顯示全部專案":
+        return dataset['df']
+
+    # 類別欄位的類別與資料集共用，因此以淺層用量估算
+    cache = get_session_cache('filter_cache', FILTER_CACHE_MAX_BYTES, size_of=lambda df: int(df.memory_usage(index=True).sum()))
+    key = filter_view_key(dataset, filter_mode, selected_projects)
+    view = cache.get(key)
+    if view is None:
+        positions = filter_positions(dataset['index'], filter_mode, selected_projects)
+        view = cache.put(key, select_rows(dataset['df'], positions))
+    return view
+
+def get_interval_index(view_key, df):
+    """取得篩選結果的時間區間索引，以篩選結果的識別鍵快取於本連線。"""
+    cache = get_session_cache(
+        'interval_index_cache', FILTER_CACHE_MAX_BYTES,
+        size_of=lambda index: sum(index[name].nbytes for name in ('order', 'starts', 'finishes'))
     )
+    index = cache.get(view_key)
+    if index is None:
+        index = cache.put(view_key, build_interval_index(df))
+    return index
 
-    # --- 修改：統一更新懸停提示的格式 ---
-    fig.update_traces(
-        textposition='inside',
-        hovertemplate=(
-            "<b>%{y}</b><br>"
-            "專案: %{custom_data[0]}<br>"
-            "狀態: %{custom_data[1]}<br>"
-            "開始: %{x[0]|%Y-%m-%d}<br>"
-            "結束: %{x[1]|%Y-%m-%d}"
-            "<extra></extra>" # 隱藏多餘的 trace name
-        )
+def apply_box_selection(chart_key, range_key, bounds):
+    """
+    st.plotly_chart 的 on_select 回呼：將甘特圖上框選的日期範圍設為新的可見範圍。
+    框選範圍會限制在 bounds (可見範圍滑桿的上下限) 之內。
+    """
+    boxes = st.session_state[chart_key].selection.get('box', [])
+    if not boxes:
+        return
+    box = boxes[-1]
+    x_values = box.get('x') or [box.get('x0'), box.get('x1')]
+    # 日期座標軸的框選範圍可能是日期字串，也可能是毫秒數
+    x0, x1 = sorted(
+        pd.Timestamp(value, unit='ms') if isinstance(value, (int, float)) else pd.Timestamp(value)
+        for value in x_values
     )
+    range_start, range_end = max(x0.date(), bounds[0]), min(x1.date(), bounds[1])
+    if range_start <= range_end:
+        st.session_state[range_key] = (range_start, range_end)
 
-    if not milestones_df.empty:
-        fig.add_trace(go.Scatter(
-            x=milestones_df['Start'], y=milestones_df['Task'], mode='markers',
-            marker=dict(symbol='diamond', color='red', size=12, line=dict(color='black', width=1)),
-            name='里程碑', hoverinfo='text',
-            hovertext=[f"<b>{row.Task}</b><br>日期: {row.Start.strftime('%Y-%m-%d')}<br>專案: {row.Project}<br>狀態: {row.Status}" for _, row in milestones_df.iterrows()]
-        ))
-
-    num_tasks = len(df['Task'].unique())
-    chart_height = max(600, num_tasks * 35)
-
-    fig.update_layout(
-        height=chart_height, xaxis_title="日期", yaxis_title="專案任務",
-        yaxis={'categoryorder':'array', 'categoryarray': df['Task'].cat.categories.tolist()},
-        title_font_size=24, font_size=14, hoverlabel=dict(bgcolor="white", font_size=12),
-        legend_title_text='圖例'
-    )
-    
-    try:
-        today_date = datetime.now()
-        fig.add_shape(type="line", x0=today_date, y0=0, x1=today_date, y1=1, yref="paper", line=dict(color="Red", width=2, dash="dash"))
-    except Exception as e:
-        st.warning(f"無法標示當天日期: {e}")
-    
-    tickvals, ticktext = get_dynamic_tick_format(df, view_mode)
-    if tickvals is not None and ticktext is not None:
-        fig.update_xaxes(rangeslider_visible=True, tickmode='array', tickvals=tickvals, ticktext=ticktext)
-    else:
-        fig.update_xaxes(rangeslider_visible=True)
+# --- 修改：切換時間軸視野或顏色模式時就地修補已快取的圖表，不重建長條 ---
+def get_gantt_chart(chart_key, df, view_mode, color_mode, render_engine, x_range=None):
+    """
+    取得甘特圖。以 (圖表資料的識別鍵, 繪圖引擎, 今天日期) 為鍵快取於本連線，
+    與圖表無關的互動造成的重新執行直接沿用已建立的圖表，不再重建軌跡、今日線與刻度。
+    快取的圖表與目前設定不同時只修補差異：時間軸視野只重設刻度，顏色模式只替換長條顏色與圖例；
+    WebGL 線段依顏色分軌，切換顏色時仍需重建。
+    """
+    if df.empty:
+        st.warning("篩選後無資料可顯示。")
+        return go.Figure()
 
-    return fig
+    cache = get_session_cache('figure_cache', FIGURE_CACHE_MAX_BYTES, size_of=lambda entry: figure_nbytes(entry['fig']))
+    key = (chart_key, render_engine, datetime.now().date())
+    entry = cache.get(key)
+    if entry is not None and entry['color_mode'] != color_mode:
+        if recolor_task_bars(entry['fig'], split_milestones(df)[0], color_mode):
+            entry['color_mode'] = color_mode
+        else:
+            entry = None
+    if entry is None:
+        fig = create_gantt_chart(df, view_mode, color_mode, render_engine, x_range)
+        if x_range is not None:
+            fig.update_xaxes(range=x_range)
+        entry = cache.put(key, {'fig': fig, 'view_mode': view_mode, 'color_mode': color_mode})
+    elif entry['view_mode'] != view_mode:
+        apply_x_ticks(entry['fig'], df, view_mode, x_range)
+        entry['view_mode'] = view_mode
+    return entry['fig']
+
+def get_tracking_status(dataset, df_view, horizon_days):
+    """
+    取得 df_view 各列的狀態分類代碼。整個資料集的分類以 (資料集指紋, 今天日期, 天數範圍) 為鍵
+    快取於本連線，切換篩選條件時只需依列位置取出 (篩選結果保留原資料集的列索引)。
+    """
+    cache = get_session_cache('status_cache', STATUS_CACHE_MAX_BYTES, size_of=lambda codes: codes.nbytes)
+    today = pd.Timestamp(datetime.now().date())
+    key = (dataset['fingerprint'], today, horizon_days)
+    codes = cache.get(key)
+    if codes is None:
+        codes = cache.put(key, classify_tracking_status(dataset['df'], today, horizon_days))
+    return codes[df_view.index.to_numpy()]
 
 # --- 主應用程式流程 ---
 
-st.sidebar.header("1. 上傳您的 CSV 檔案")
-uploaded_file = st.sidebar.file_uploader("請選擇一個 CSV 檔案", type=["csv"])
+st.sidebar.header("1. 上傳您的專案檔案")
+# --- 修改：安裝 pyarrow 時可直接上傳 Parquet / Feather / Arrow IPC 檔案 ---
+upload_types = ["csv"] + (list(COLUMNAR_FORMATS) if HAS_PYARROW else [])
+uploaded_file = st.sidebar.file_uploader("請選擇一個 CSV / Parquet / Feather / Arrow 檔案", type=upload_types)
+# --- 新增：解析引擎選擇 (未安裝 pyarrow 時僅提供 pandas) ---
+engine_options = [ENGINE_PANDAS] + ([ENGINE_ARROW] if HAS_PYARROW else [])
+# 預設使用 pandas 分塊串流：記憶體用量以單一區塊為上限並顯示讀取進度；
+# pyarrow 以多執行緒一次讀完整個檔案，速度較快但記憶體峰值較高、沒有進度條
+parse_engine = st.sidebar.selectbox(
+    "選擇解析引擎",
+    options=engine_options,
+    index=0,
+    help="pandas 分塊串流：記憶體用量較低並顯示讀取進度。pyarrow：多執行緒一次讀取，速度較快但需要較多記憶體。"
+)
 
 if uploaded_file is not None:
+    # --- 新增：有上傳檔案時才載入處理資料與繪圖的模組 (背景預載完成後只是查表) ---
+    import numpy as np
+    import pandas as pd
+    import plotly.graph_objects as go
+    import plotly.io as pio
+    from gantt_core import (
+        FILTER_MODES, RENDER_AUTO, RENDER_SVG, RENDER_WEBGL, TRACKING_LABELS, TRACKING_LATE, TRACKING_OVERDUE,
+        TRACKING_UPCOMING, UPCOMING_HORIZON_DAYS, VIEW_MODES, WEBGL_TASK_THRESHOLD, LRUCache, aggregate_projects,
+        apply_x_ticks, build_interval_index, build_project_type_index, classify_tracking_status,
+        create_gantt_chart, figure_nbytes, file_format_for, filter_positions, load_tasks, page_tasks,
+        query_interval_index, recolor_task_bars, select_rows, split_milestones,
+    )
+    # --- 新增：介面的圖表固定以標準 json 引擎序列化 ---
+    # st.plotly_chart 呼叫 pio.to_json 時不指定引擎；plotly 預設 ("auto") 在安裝 orjson 時會改用 orjson，
+    # 但圖表中的文字欄位是 object 陣列，orjson 無法直接編碼而退回逐項清理，實測比標準 json 慢一倍以上
+    # (benchmarks/bench_figure_json.py)。只在介面中設定，不影響匯入 gantt_core 的其他程式。
+    pio.json.config.default_engine = "json"
+
     try:
-        df_original = pd.read_csv(uploaded_file)
-        df_processed = preprocess_data(df_original.copy())
-        st.success("CSV 檔案上傳並處理成功！")
+        # --- 修改：預處理後的資料集存放於 session state，整個流程共用同一份 ---
+        dataset = get_session_dataset(uploaded_file, parse_engine)
+        df_processed = dataset['df']
+        st.success("檔案上傳並處理成功！")
+        if 'memory_after' in df_processed.attrs:
+            st.caption(
+                f"資料記憶體用量：{df_processed.attrs['memory_before'] / 1024 ** 2:.1f} MB → "
+                f"{df_processed.attrs['memory_after'] / 1024 ** 2:.1f} MB (已套用精簡欄位型別)"
+            )
+        # --- 新增：提示無法解析而轉為空值的日期筆數 ---
+        coerced_dates = {col: n for col, n in df_processed.attrs.get('coerced_dates', {}).items() if n}
+        if coerced_dates:
+            details = "、".join(f"{col} {n:,} 筆" for col, n in coerced_dates.items())
+            st.warning(f"有 {sum(coerced_dates.values()):,} 筆日期無法解析，已視為空值 (NaT)：{details}。日期建議使用 YYYY-MM-DD 格式。")
 
         st.sidebar.header("2. 篩選專案")
         filter_mode = st.sidebar.selectbox(
             "選擇顯示模式",
-            ["顯示全部專案", "只顯示母專案", "依母專案篩選"],
+            FILTER_MODES,
             index=0
         )
 
-        df_filtered = df_processed.copy()
-        if filter_mode == "只顯示母專案":
-            df_filtered = df_processed[df_processed['Type'] == '母專案'].copy()
-            df_filtered['Task'] = df_filtered['Task'].cat.remove_unused_categories()
-        elif filter_mode == "依母專案篩選":
-            parent_projects = df_processed[df_processed['Type'] == '母專案']['Project'].unique().tolist()
+        # --- 修改：篩選結果由專案/類型索引產生並快取，「顯示全部專案」直接沿用資料集 ---
+        df_filtered = None
+        selected_projects = []
+        if filter_mode == "依母專案篩選":
+            parent_projects = dataset['index']['parent_projects']
             if parent_projects:
                 selected_projects = st.sidebar.multiselect(
                     "請選擇要顯示的母專案",
                     options=parent_projects,
                     default=parent_projects[0] if parent_projects else None
                 )
-                if selected_projects:
-                    df_filtered = df_processed[df_processed['Project'].isin(selected_projects)].copy()
-                    df_filtered['Task'] = df_filtered['Task'].cat.remove_unused_categories()
-                else:
-                    df_filtered = pd.DataFrame(columns=df_processed.columns)
-                    df_filtered['Task'] = pd.Categorical(df_filtered['Task'])
             else:
                 st.sidebar.warning("檔案中沒有找到任何『母專案』。")
-                df_filtered = pd.DataFrame(columns=df_processed.columns)
+                df_filtered = select_rows(df_processed, np.array([], dtype=np.intp))
+        if df_filtered is None:
+            df_filtered = get_filtered_view(dataset, filter_mode, selected_projects)
+        view_key = filter_view_key(dataset, filter_mode, selected_projects)
 
         st.sidebar.header("3. 甘特圖設定")
         view_mode = st.sidebar.selectbox(
             "選擇時間軸視野",
-            ["每日", "每周", "每月", "每季", "每半年", "每年"],
+            VIEW_MODES,
             index=1
         )
         
@@ -219,6 +307,58 @@ if uploaded_file is not None:
             index=0
         )
 
+        # --- 新增：繪圖引擎選擇，任務量大時以 WebGL 繪製 ---
+        render_engine = st.sidebar.selectbox(
+            "選擇繪圖引擎",
+            options=[RENDER_AUTO, RENDER_SVG, RENDER_WEBGL],
+            index=0,
+            help=f"「自動」會在篩選後 (分頁前) 的任務長條超過 {WEBGL_TASK_THRESHOLD:,} 個時改用 WebGL，各頁使用相同的引擎。"
+        )
+
+        # --- 新增：可見範圍模式，只傳送與可見日期範圍相交的任務 (以排序後的區間索引查詢) ---
+        df_chart = df_filtered
+        # 圖表資料的識別鍵：篩選條件加上後續的可見範圍、彙總與分頁設定
+        chart_key = [view_key]
+        visible_range = None
+        interval_index = get_interval_index(view_key, df_filtered) if not df_filtered.empty else None
+        if interval_index is not None and len(interval_index['order']):
+            viewport_enabled = st.sidebar.toggle(
+                "只傳送可見範圍內的任務",
+                value=len(df_filtered) > VIEWPORT_ROW_THRESHOLD,
+                help="可拖曳下方滑桿，或在甘特圖上以框選工具選取日期範圍。"
+            )
+            if viewport_enabled:
+                first_date = pd.Timestamp(interval_index['starts'][0]).date()
+                last_date = max(pd.Timestamp(interval_index['finishes'].max()).date(), first_date)
+                # 滑桿的上下限不可相同：所有列都在同一天 (例如只有里程碑) 時，上限多放寬一天
+                bounds = (first_date, max(last_date, first_date + timedelta(days=1)))
+                today = datetime.now().date()
+                # 預設起點不超過最後一個有任務的日期，範圍才不會只落在放寬的那一天
+                default_start = min(max(today - timedelta(days=VIEWPORT_DEFAULT_DAYS), bounds[0]), last_date)
+                default_end = max(min(today + timedelta(days=VIEWPORT_DEFAULT_DAYS), bounds[1]), default_start)
+                range_key = f"viewport_range_{hashlib.md5(repr(view_key).encode()).hexdigest()}"
+                visible_range = st.sidebar.slider(
+                    "可見時間範圍",
+                    min_value=bounds[0], max_value=bounds[1],
+                    value=(default_start, default_end),
+                    key=range_key
+                )
+                range_end = pd.Timestamp(visible_range[1]) + pd.Timedelta(days=1)
+                df_chart = select_rows(df_filtered, query_interval_index(interval_index, visible_range[0], range_end))
+                visible_rows = len(df_chart)
+                chart_key.append(('viewport', visible_range))
+
+        # --- 新增：年/半年視野且資料量大時，將任務收合為每個專案一列，可個別展開 ---
+        lod_rows = None  # 彙總後的列數 (分頁之前)，未啟用彙總檢視時為 None
+        if view_mode in LOD_VIEW_MODES and len(df_chart) > LOD_ROW_THRESHOLD:
+            expanded_projects = st.sidebar.multiselect(
+                "展開專案 (顯示個別任務)",
+                options=df_chart['Project'].dropna().unique().tolist()
+            )
+            df_chart = aggregate_projects(df_chart, expanded_projects)
+            lod_rows = len(df_chart)
+            chart_key.append(('lod', tuple(sorted(expanded_projects))))
+
         st.subheader("資料預覽 (根據篩選結果)")
         if not df_filtered.empty:
             preview_cols = ['Task', 'Project', 'Type', 'Status', 'Start', 'Finish']
@@ -226,27 +366,60 @@ if uploaded_file is not None:
         else:
             st.info("目前篩選條件下沒有資料可顯示。")
 
-        # --- 修改：傳入 color_mode 參數 ---
-        gantt_chart = create_gantt_chart(df_filtered, view_mode, color_mode)
-        st.plotly_chart(gantt_chart, use_container_width=True)
+        # 「自動」依分頁前的任務長條數決定繪圖引擎：每頁最多 2,000 列，依單頁判斷永遠不會超過 WEBGL_TASK_THRESHOLD
+        if render_engine == RENDER_AUTO:
+            render_engine = RENDER_WEBGL if len(split_milestones(df_chart)[0]) > WEBGL_TASK_THRESHOLD else RENDER_SVG
+
+        # --- 新增：任務列超過一頁時分頁顯示，只序列化目前頁面的任務 ---
+        num_task_rows = len(df_chart['Task'].cat.categories) if not df_chart.empty else 0
+        page_size = st.sidebar.number_input(
+            "每頁顯示的任務列數", min_value=50, max_value=2_000, value=TASK_PAGE_SIZE, step=50
+        )
+        if num_task_rows > page_size:
+            num_pages = -(-num_task_rows // page_size)
+            page = st.sidebar.number_input(f"頁碼 (共 {num_pages:,} 頁)", min_value=1, max_value=num_pages, value=1, step=1)
+            df_chart = page_tasks(df_chart, page, page_size)
+            chart_key.append(('page', page, page_size))
+            first_row = (page - 1) * page_size + 1
+            st.caption(f"任務列 {first_row:,}–{min(page * page_size, num_task_rows):,} / 共 {num_task_rows:,} 列")
+
+        # --- 修改：傳入 color_mode 參數，並快取建立好的圖表 ---
+        x_range = None if visible_range is None else [pd.Timestamp(visible_range[0]), range_end]
+        gantt_chart = get_gantt_chart(tuple(chart_key), df_chart, view_mode, color_mode, render_engine, x_range)
+        if visible_range is None:
+            st.plotly_chart(gantt_chart, use_container_width=True)
+        else:
+            st.plotly_chart(
+                gantt_chart, use_container_width=True, key="gantt_chart",
+                on_select=lambda: apply_box_selection("gantt_chart", range_key, bounds),
+                selection_mode="box"
+            )
+            st.caption(f"可見範圍模式：{len(df_filtered):,} 列中有 {visible_rows:,} 列與可見範圍相交。")
+        if gantt_chart.layout.legend.itemclick is False:
+            # SVG 長條合併為單一軌跡，圖例只標示顏色
+            st.caption("圖例僅標示顏色，點擊圖例無法隱藏群組；請使用左側的篩選條件縮小範圍。")
+        if lod_rows is not None:
+            st.caption(
+                f"彙總檢視：任務已收合為 {lod_rows:,} 列，"
+                "可於左側「展開專案」查看個別任務。"
+            )
 
         st.header("專案狀態追蹤 (根據篩選結果)")
         if not df_filtered.empty:
-            today = pd.to_datetime(datetime.now().date())
-            upcoming_tasks = df_filtered[
-                (df_filtered['Finish'] >= today) & 
-                (df_filtered['Finish'] <= today + timedelta(days=7)) &
-                (df_filtered['Completion_Date'].isnull())
-            ]
-            overdue_tasks = df_filtered[
-                ((df_filtered['Finish'] < today) & (df_filtered['Completion_Date'].isnull())) |
-                (pd.notnull(df_filtered['Completion_Date']) & pd.notnull(df_filtered['Finish']) &
-                 (df_filtered['Completion_Date'] > df_filtered['Finish']))
-            ].drop_duplicates()
+            # --- 修改：由狀態追蹤引擎一次完成分類，即將到期的天數可調整 ---
+            horizon_days = int(st.number_input(
+                "即將到期的天數範圍", min_value=1, max_value=365, value=UPCOMING_HORIZON_DAYS, step=1
+            ))
+            status_codes = get_tracking_status(dataset, df_filtered, horizon_days)
+            upcoming_tasks = df_filtered[status_codes == TRACKING_UPCOMING]
+            # 已超時包含尚未完成且已過預計結束日，以及實際遞交日晚於預計結束日的項目
+            overdue_tasks = df_filtered[np.isin(status_codes, (TRACKING_OVERDUE, TRACKING_LATE))]
+            counts = np.bincount(status_codes, minlength=len(TRACKING_LABELS))
+            st.caption("、".join(f"{label} {count:,} 筆" for label, count in zip(TRACKING_LABELS[1:], counts[1:])))
 
             col1, col2 = st.columns(2)
             with col1:
-                st.subheader("⚠️ 即將到期的項目 (未來7天)")
+                st.subheader(f"⚠️ 即將到期的項目 (未來{horizon_days}天)")
                 if not upcoming_tasks.empty:
                     st.dataframe(upcoming_tasks[['Task', 'Project', 'Status', 'Finish']].rename(columns={'Finish': '預計結束日'}))
                 else:
@@ -264,4 +437,7 @@ if uploaded_file is not None:
         st.error(f"處理檔案時發生錯誤：{e}")
         st.warning("請確認您的 CSV 檔案格式是否正確，特別是日期欄位 (YYYY-MM-DD) 以及 'Task', 'Start', 'Finish', 'Project', 'Type' 欄位是否存在。也請檢查選用的 `Status` 欄位。")
 else:
-    st.info("請在左側側邊欄上傳您的專案 CSV 檔案以開始。")
+    st.info("請在左側側邊欄上傳您的專案 CSV (或 Parquet / Feather / Arrow) 檔案以開始。")
+    # 首個畫面送出後才開始預載，不拖慢畫面出現的時間
+    if PRELOAD_IN_BACKGROUND:
+        start_background_preload()
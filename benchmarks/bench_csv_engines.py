@@ -0,0 +1,38 @@
+"""
+比較 CSV 解析引擎：原始的 read_csv + preprocess_data、分塊串流讀取與 pyarrow 引擎。
+
+執行方式：python benchmarks/bench_csv_engines.py [列數 ...]
+"""
+import io
+import sys
+
+import pandas as pd
+
+from common import best_of, load_core, make_portfolio_csv
+
+
+def main(sizes):
+    core = load_core()
+    if core.pa is None:
+        print("未安裝 pyarrow，僅測試 pandas 路徑。")
+
+    for n_rows in sizes:
+        file_bytes = make_portfolio_csv(n_rows)
+        print(f"\n{n_rows:,} 列 ({len(file_bytes) / 1024 ** 2:.1f} MB)")
+
+        cases = {
+            "read_csv + preprocess_data": lambda: core.preprocess_data(pd.read_csv(io.BytesIO(file_bytes))),
+            "chunked stream": lambda: core.order_tasks(core.read_csv_in_chunks(file_bytes)),
+        }
+        if core.pa is not None:
+            cases["pyarrow"] = lambda: core.order_tasks(core.read_csv_with_arrow(file_bytes))
+
+        baseline = None
+        for name, func in cases.items():
+            seconds, _ = best_of(func)
+            baseline = baseline or seconds
+            print(f"  {name:<28}{seconds:8.3f} s  ({baseline / seconds:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [100_000, 1_000_000])
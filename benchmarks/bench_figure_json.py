@@ -0,0 +1,93 @@
+"""
+比較甘特圖 JSON 序列化的大小與耗時，日期的編碼方式：
+    datetime64   長條起點與里程碑日期皆為 datetime64 (plotly 展開為完整 ISO 時間字串)
+    日期字串     兩者皆為精簡日期字串
+    毫秒數       長條起點為 Python 整數毫秒數 (base 無法以型別陣列傳送)，懸停提示另附開始日期字串；
+                 里程碑為 float64 毫秒數
+    目前         長條起點為精簡日期字串、里程碑為 float64 毫秒數 (以 base64 型別陣列傳送)
+並分別以標準 json 與 orjson (若已安裝) 編碼。
+
+執行方式：python benchmarks/bench_figure_json.py [任務數 ...]
+"""
+import io
+import sys
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from common import best_of, load_core, make_portfolio_csv
+
+try:
+    import orjson  # noqa: F401
+    ENGINES = ["json", "orjson"]
+except ImportError:
+    ENGINES = ["json"]
+
+
+def encode_dates(fig, bar_dates, milestone_dates, hover_start=False):
+    """
+    以 bar_dates / milestone_dates 轉換長條起點 (原為日期字串) 與里程碑日期 (原為毫秒數)。
+    hover_start 為 True 時，在 customdata 另附開始日期字串 (起點為數值時 %{base|...} 無法格式化日期)。
+    """
+    fig = go.Figure(fig)
+    for trace in fig.data:
+        if trace.type == 'bar' and trace.base is not None:
+            starts = as_datetime64(trace.base)
+            trace.base = bar_dates(starts)
+            if hover_start:
+                trace.customdata = np.column_stack([trace.customdata, np.datetime_as_string(starts, unit='D')])
+                trace.hovertemplate = trace.hovertemplate.replace("%{base|%Y-%m-%d}", "%{customdata[2]}")
+        elif trace.type != 'bar' and trace.mode == 'markers':
+            trace.x = milestone_dates(as_datetime64(trace.x))
+    return fig
+
+
+def as_datetime64(values):
+    values = np.asarray(values)
+    if values.dtype.kind == 'f':
+        return pd.to_datetime(values, unit='ms').to_numpy()
+    return pd.to_datetime(values).to_numpy()
+
+
+def as_date_strings(dates):
+    text = np.datetime_as_string(dates, unit='D').astype(object)
+    text[np.isnat(dates)] = None
+    return text
+
+
+def as_epoch_ms(dates):
+    ms = dates.astype('datetime64[ms]').astype(np.int64).astype(np.float64)
+    ms[np.isnat(dates)] = np.nan
+    return ms
+
+
+def as_epoch_ms_ints(dates):
+    ms = dates.astype('datetime64[ms]').astype(np.int64).astype(object)
+    ms[np.isnat(dates)] = None
+    return ms
+
+
+def main(sizes):
+    core = load_core()
+    for n_tasks in sizes:
+        df = core.preprocess_data(pd.read_csv(io.BytesIO(make_portfolio_csv(n_tasks))))
+        print(f"\n{len(df):,} 列")
+        for render_engine in [core.RENDER_SVG, core.RENDER_WEBGL]:
+            fig = core.create_gantt_chart(df, "每月", "依專案區分顏色", render_engine)
+            variants = [
+                ("datetime64", encode_dates(fig, as_datetime64, as_datetime64)),
+                ("日期字串", encode_dates(fig, as_date_strings, as_date_strings)),
+                ("毫秒數", encode_dates(fig, as_epoch_ms_ints, as_epoch_ms, hover_start=True)),
+                ("目前", fig),
+            ]
+            for label, fig in variants:
+                label = f"{render_engine:5s} {label}"
+                for engine in ENGINES:
+                    seconds, payload = best_of(lambda: pio.to_json(fig, validate=False, engine=engine), repeat=5)
+                    print(f"  {label:16s} {engine:7s} {len(payload) / 1e6:7.2f} MB {seconds:8.3f} s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
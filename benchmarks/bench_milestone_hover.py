@@ -0,0 +1,47 @@
+"""
+比較里程碑懸停提示的建立方式：原本以 iterrows 逐列組字串，與 customdata + hovertemplate。
+
+執行方式：python benchmarks/bench_milestone_hover.py [里程碑數 ...]
+"""
+import io
+import sys
+
+import pandas as pd
+import plotly.graph_objects as go
+
+from common import best_of, load_core, make_portfolio_csv
+
+
+def iterrows_trace(milestones_df):
+    """原本 create_gantt_chart 中的里程碑軌跡寫法。"""
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(
+        x=milestones_df['Start'], y=milestones_df['Task'], mode='markers',
+        marker=dict(symbol='diamond', color='red', size=12, line=dict(color='black', width=1)),
+        name='里程碑', hoverinfo='text',
+        hovertext=[f"<b>{row.Task}</b><br>日期: {row.Start.strftime('%Y-%m-%d')}<br>專案: {row.Project}<br>狀態: {row.Status}" for _, row in milestones_df.iterrows()]
+    ))
+    return fig
+
+
+def customdata_trace(core, milestones_df):
+    fig = go.Figure()
+    core.add_milestone_trace(fig, milestones_df)
+    return fig
+
+
+def main(sizes):
+    core = load_core()
+    for n_milestones in sizes:
+        # 產生器中約 15% 的列為里程碑
+        df = core.preprocess_data(pd.read_csv(io.BytesIO(make_portfolio_csv(int(n_milestones / 0.15 * 1.1)))))
+        milestones_df = df[(df['Type'] == '里程碑') & df['Start'].notna()].head(n_milestones)
+        baseline, _ = best_of(lambda: iterrows_trace(milestones_df))
+        vectorized, _ = best_of(lambda: customdata_trace(core, milestones_df))
+        print(f"\n{len(milestones_df):,} 個里程碑")
+        print(f"  iterrows + hovertext     {baseline:8.3f} s")
+        print(f"  customdata + template    {vectorized:8.3f} s  ({baseline / vectorized:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 50_000])
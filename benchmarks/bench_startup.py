@@ -0,0 +1,65 @@
+"""
+量測介面冷啟動到首個畫面 (尚未上傳檔案) 的時間：延遲載入 (目前的寫法) 與啟動時即匯入
+numpy / pandas / plotly 及 gantt_core 處理模組 (修改前的寫法)。
+
+每次量測都在全新的 Python 行程中以 Streamlit 的 bare mode 執行整個介面腳本，
+計時從行程開始匯入 streamlit 到腳本執行完畢；另列出含直譯器啟動的行程總耗時。
+
+執行方式：python benchmarks/bench_startup.py [重複次數]
+"""
+import json
+import subprocess
+import sys
+import time
+
+from common import REPO_ROOT
+
+APP_PATH = REPO_ROOT / "202507-app.py"
+
+# 修改前介面頂端匯入的模組
+EAGER_IMPORTS = (
+    "import numpy, pandas, plotly.graph_objects\n"
+    "import gantt_core.cache, gantt_core.ingest, gantt_core.filters, gantt_core.figure, gantt_core.status\n"
+)
+
+CHILD_SCRIPT = """
+import time
+start = time.perf_counter()
+import json, os, runpy, sys
+sys.path.insert(0, {root!r})
+import streamlit
+{eager_imports}
+runpy.run_path({app!r}, run_name="__main__")
+seconds = time.perf_counter() - start
+print(json.dumps(dict(seconds=seconds, pandas_loaded="pandas" in sys.modules)))
+sys.stdout.flush()
+os._exit(0)  # 不等待背景預載執行緒
+"""
+
+
+def run_once(eager):
+    """在新行程中執行介面腳本一次，回傳 (腳本耗時, 行程總耗時, 是否已載入 pandas)。"""
+    code = CHILD_SCRIPT.format(root=str(REPO_ROOT), app=str(APP_PATH), eager_imports=EAGER_IMPORTS if eager else "")
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    wall = time.perf_counter() - start
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    return report["seconds"], wall, report["pandas_loaded"]
+
+
+def main(repeat):
+    run_once(eager=False)  # 先執行一次，讓作業系統快取 .pyc 與套件檔案
+    results = {}
+    for label, eager in [("啟動時匯入 (修改前)", True), ("延遲載入", False)]:
+        runs = [run_once(eager) for _ in range(repeat)]
+        results[label] = (min(r[0] for r in runs), min(r[1] for r in runs), runs[-1][2])
+
+    print(f"冷啟動到首個畫面 (取 {repeat} 次中的最短時間)")
+    baseline = results["啟動時匯入 (修改前)"][0]
+    for label, (seconds, wall, pandas_loaded) in results.items():
+        print(f"  {label:12s} 腳本 {seconds:6.3f} s  行程總計 {wall:6.3f} s  "
+              f"pandas 已載入：{'是' if pandas_loaded else '否'}  ({baseline / seconds:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5)
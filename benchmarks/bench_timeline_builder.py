@@ -0,0 +1,52 @@
+"""
+比較任務長條的建立方式：原本的 px.timeline 與直接由欄位陣列建立的 add_bar_task_traces。
+
+執行方式：python benchmarks/bench_timeline_builder.py [任務數 ...]
+"""
+import io
+import sys
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from common import best_of, load_core, make_portfolio_csv
+
+
+def px_timeline(core, tasks_df, color_mode):
+    """原本 create_gantt_chart 中以 px.timeline 建立長條的寫法。"""
+    if color_mode == '依進度狀態區分顏色':
+        color_arg, color_map_arg = 'Status', core.STATUS_COLOR_MAP
+    else:
+        color_arg, color_map_arg = 'Project', None
+    fig = px.timeline(
+        tasks_df, x_start="Start", x_end="Finish", y="Task",
+        color=color_arg, color_discrete_map=color_map_arg,
+        hover_name="Task", custom_data=['Project', 'Status'], title="專案時程甘特圖"
+    )
+    fig.update_traces(textposition='inside', hovertemplate=core.BAR_HOVER_TEMPLATE)
+    return fig
+
+
+def direct_builder(core, tasks_df, color_mode):
+    fig = go.Figure(layout=dict(title="專案時程甘特圖", xaxis_type='date', barmode='overlay'))
+    core.add_bar_task_traces(fig, tasks_df, color_mode)
+    return fig
+
+
+def main(sizes):
+    core = load_core()
+    for n_tasks in sizes:
+        df = core.preprocess_data(pd.read_csv(io.BytesIO(make_portfolio_csv(int(n_tasks * 1.2)))))
+        tasks_df = df[df['Type'] != '里程碑'].head(n_tasks)
+        print(f"\n{len(tasks_df):,} 個任務")
+        for color_mode in ['依專案區分顏色', '依進度狀態區分顏色']:
+            baseline, fig_px = best_of(lambda: px_timeline(core, tasks_df, color_mode))
+            direct, fig_direct = best_of(lambda: direct_builder(core, tasks_df, color_mode))
+            print(f"  {color_mode} ({len(fig_direct.data)} 條軌跡)")
+            print(f"    px.timeline         {baseline:8.3f} s")
+            print(f"    add_bar_task_traces {direct:8.3f} s  ({baseline / direct:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or [10_000, 100_000])
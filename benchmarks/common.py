@@ -0,0 +1,128 @@
+"""
+效能測試共用工具：載入 gantt_core 核心套件、產生測試用的專案 CSV。
+"""
+import importlib
+import io
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def load_core():
+    """
+    載入不依賴 Streamlit 的 gantt_core 套件 (位於專案根目錄，從 benchmarks/ 執行時需先加入路徑)。
+    """
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    return importlib.import_module("gantt_core")
+
+
+# --- 新增：合成專案資料的設定 ---
+PORTFOLIO_START = pd.Timestamp("2023-01-01")
+# 推算狀態時假設的「今天」，固定下來讓同一個種子永遠產生相同的檔案
+PORTFOLIO_REFERENCE_DATE = pd.Timestamp("2025-07-01")
+ROWS_PER_PROJECT = 50         # 平均每個母專案的列數
+PORTFOLIO_CHUNK_ROWS = 500_000  # 分塊產生的列數 (須為 ROWS_PER_PROJECT 的倍數)，大檔案不必一次放進記憶體
+STATUS_VALUES = ("Closed", "In process", "Not start", "")
+OWNERS = tuple(f"PM-{i:02d}" for i in range(20))
+
+
+def format_dates(values):
+    """datetime64 陣列轉為 YYYY-MM-DD 字串，NaT 輸出為空字串 (CSV 中的缺漏值)。"""
+    values = np.asarray(values, dtype="datetime64[D]")
+    text = np.datetime_as_string(values, unit="D").astype(object)
+    text[np.isnat(values)] = ""
+    return text
+
+
+def make_portfolio_frame(n_rows, seed=0, first_row=0):
+    """
+    產生 n_rows 列的合成專案資料 (欄位與主程式的輸入格式相同，日期為字串)：
+    - 每個母專案平均 ROWS_PER_PROJECT 列；子專案與里程碑 (約 15%) 落在所屬母專案的期間內，里程碑開始日等於結束日。
+    - Status 依日期相對 PORTFOLIO_REFERENCE_DATE 推得，另有 5% 隨機改為任一狀態 (含空白)。
+    - Completion_Date：Closed 項目提早、準時或延遲遞交，其中 10% 漏填；未完成項目有 3% 已填寫。
+    - 約 1% 缺開始日、1% 缺結束日，另附 Owner / Budget 兩個主程式不使用的欄位。
+    first_row 為此區塊第一列的全域序號，用於分塊產生時延續任務與專案編號。
+    """
+    rng = np.random.default_rng([seed, first_row])
+    n_projects = max(1, n_rows // ROWS_PER_PROJECT)
+    first_project = first_row // ROWS_PER_PROJECT
+
+    # 每個專案一列母專案，其餘列隨機分配給各專案
+    project = np.concatenate([np.arange(n_projects), rng.integers(0, n_projects, n_rows - n_projects)])
+    is_parent = np.arange(n_rows) < n_projects
+    is_milestone = ~is_parent & (rng.random(n_rows) < 0.16)
+    row_type = np.where(is_parent, "母專案", np.where(is_milestone, "里程碑", "子專案")).astype(object)
+
+    # 母專案的期間決定所屬任務的日期範圍
+    parent_offset = rng.integers(0, 1000, n_projects)
+    parent_days = rng.integers(60, 720, n_projects)
+    offset = parent_offset[project] + (rng.random(n_rows) * parent_days[project]).astype(np.int64)
+    duration = rng.integers(1, 120, n_rows)
+    offset[is_parent], duration[is_parent] = parent_offset, parent_days
+    duration[is_milestone] = 0
+    starts = np.datetime64(PORTFOLIO_START.date(), "D") + offset
+    finishes = starts + duration
+
+    reference = np.datetime64(PORTFOLIO_REFERENCE_DATE.date(), "D")
+    status = np.select([finishes < reference, starts <= reference], ["Closed", "In process"], "Not start").astype(object)
+    noisy = rng.random(n_rows) < 0.05
+    status[noisy] = rng.choice(STATUS_VALUES, int(noisy.sum()))
+
+    # 遞交日：提早 1~14 天、準時、延遲 1~30 天
+    pattern = rng.choice(3, n_rows, p=[0.25, 0.35, 0.40])
+    delay = np.select([pattern == 0, pattern == 2], [-rng.integers(1, 15, n_rows), rng.integers(1, 31, n_rows)], 0)
+    completion = finishes + delay
+    is_closed = status == "Closed"
+    filled = np.where(is_closed, rng.random(n_rows) >= 0.10, rng.random(n_rows) < 0.03)
+    completion[~filled] = np.datetime64("NaT")
+
+    starts[rng.random(n_rows) < 0.01] = np.datetime64("NaT")
+    finishes[rng.random(n_rows) < 0.01] = np.datetime64("NaT")
+
+    task_ids = np.arange(first_row, first_row + n_rows)
+    return pd.DataFrame({
+        "Task": pd.Series(task_ids).map("Task-{}".format),
+        "Project": pd.Series(project + first_project).map("Project-{:06d}".format),
+        "Type": row_type,
+        "Start": format_dates(starts),
+        "Finish": format_dates(finishes),
+        "Status": status,
+        "Completion_Date": format_dates(completion),
+        "Owner": rng.choice(OWNERS, n_rows),
+        "Budget": rng.integers(1, 500, n_rows) * 1000,
+    })
+
+
+def write_portfolio_csv(target, n_rows, seed=0, chunk_rows=PORTFOLIO_CHUNK_ROWS):
+    """
+    分塊產生 n_rows 列的合成專案資料並寫入 target (路徑或檔案物件)。
+    同樣的 n_rows 與 seed 一定產生相同內容，不受寫入目標影響。
+    """
+    for first_row in range(0, n_rows, chunk_rows):
+        chunk = make_portfolio_frame(min(chunk_rows, n_rows - first_row), seed, first_row)
+        chunk.to_csv(target, mode="w" if first_row == 0 else "a", header=first_row == 0, index=False)
+
+
+def make_portfolio_csv(n_rows, seed=0):
+    """
+    產生 n_rows 列的專案 CSV 位元組 (內容見 make_portfolio_frame)。
+    """
+    buffer = io.StringIO()
+    write_portfolio_csv(buffer, n_rows, seed)
+    return buffer.getvalue().encode("utf-8")
+
+
+def best_of(func, repeat=3):
+    """執行 func 數次，回傳最短耗時 (秒) 與最後一次的回傳值。"""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
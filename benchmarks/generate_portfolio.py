@@ -0,0 +1,30 @@
+"""
+產生合成專案 CSV 檔案 (內容見 common.make_portfolio_frame)，可用於手動測試介面或批次工具。
+同樣的列數與種子一定產生相同的檔案；大檔案分塊寫入，不必一次放進記憶體。
+
+執行方式：python benchmarks/generate_portfolio.py 1000 100000 5000000 -o data/ --seed 0
+"""
+import argparse
+import os
+import time
+
+from common import write_portfolio_csv
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="產生合成專案 CSV 檔案。")
+    parser.add_argument("sizes", nargs="+", type=int, help="資料列數 (例如 1000 5000000)")
+    parser.add_argument("-o", "--output-dir", default=".", help="輸出目錄 (預設：目前目錄)")
+    parser.add_argument("--seed", type=int, default=0, help="亂數種子 (預設：0)")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    for n_rows in args.sizes:
+        path = os.path.join(args.output_dir, f"portfolio_{n_rows}_seed{args.seed}.csv")
+        start = time.perf_counter()
+        write_portfolio_csv(path, n_rows, args.seed)
+        print(f"{path}：{n_rows:,} 列，{os.path.getsize(path) / 1024 ** 2:.1f} MB，{time.perf_counter() - start:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
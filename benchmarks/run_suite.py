@@ -0,0 +1,155 @@
+"""
+效能測試套件：以合成專案資料量測讀取、預處理、各篩選模式、狀態追蹤、建立圖表與序列化的耗時，
+結果寫入 JSON 檔，可與先前的結果比較，確認修改 preprocess_data 或 create_gantt_chart 後是否變慢。
+
+執行方式：
+    python benchmarks/run_suite.py                          # 預設 1k / 10k / 100k 列
+    python benchmarks/run_suite.py 1000000 5000000 --repeat 1 -o results/large.json
+    python benchmarks/run_suite.py --compare results/before.json
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly
+import plotly.io as pio
+
+from common import REPO_ROOT, best_of, load_core, make_portfolio_csv
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+FIGURE_MAX_ROWS = 200_000      # 建立圖表與序列化只取前段資料列 (介面同樣會分頁或切換可見範圍)
+SELECTED_PROJECT_COUNT = 5     # 「依母專案篩選」模式選取的母專案數
+REGRESSION_RATIO = 1.2         # 比較時，耗時超過先前結果此倍數者標示為變慢
+# 階段名稱使用固定的英文代號，介面文字改動時仍能與舊結果比較 (依 FILTER_MODES / COLOR_MODES 的順序)
+FILTER_STAGE_NAMES = ("all", "parents_only", "selected_projects")
+COLOR_STAGE_NAMES = ("by_project", "by_status")
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(core, args):
+    return dict(
+        timestamp=datetime.now().isoformat(timespec="seconds"),
+        commit=git_commit(),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        cpu_count=os.cpu_count(),
+        pandas=pd.__version__,
+        numpy=np.__version__,
+        plotly=plotly.__version__,
+        pyarrow=core.pa.__version__ if core.pa is not None else None,
+        seed=args.seed,
+        repeat=args.repeat,
+    )
+
+
+def run_size(core, n_rows, seed, repeat):
+    """對單一資料量執行所有階段，回傳 [{stage, rows, seconds, ...}, ...]。"""
+    results = []
+
+    def measure(stage, func, rows, **extra):
+        seconds, value = best_of(func, repeat)
+        results.append(dict(stage=stage, rows=rows, seconds=round(seconds, 6), **extra))
+        print(f"  {stage:32s} {rows:>10,} 列 {seconds:9.4f} s")
+        return value
+
+    start = time.perf_counter()
+    file_bytes = make_portfolio_csv(n_rows, seed)
+    print(f"\n{n_rows:,} 列 ({len(file_bytes) / 1024 ** 2:.1f} MB，產生耗時 {time.perf_counter() - start:.1f} s)")
+
+    # 讀取：原始 read_csv 與兩種解析引擎 (含欄位正規化)
+    raw = measure("ingest.read_csv", lambda: pd.read_csv(io.BytesIO(file_bytes)), n_rows,
+                  megabytes=round(len(file_bytes) / 1024 ** 2, 2))
+    measure("ingest.pandas_chunks", lambda: core.read_csv_in_chunks(file_bytes), n_rows)
+    if core.pa is not None:
+        measure("ingest.pyarrow", lambda: core.read_csv_with_arrow(file_bytes), n_rows)
+
+    # 預處理：preprocess_data 會修改傳入的資料表，每次量測都以副本開始
+    measure("preprocess.copy_only", lambda: raw.copy(), n_rows)
+    df = measure("preprocess.preprocess_data", lambda: core.preprocess_data(raw.copy()), n_rows)
+    measure("preprocess.load_tasks", lambda: core.load_tasks(file_bytes), n_rows)
+
+    # 篩選：建立索引後依各模式選取資料列
+    index = measure("filter.build_index", lambda: core.build_project_type_index(df), n_rows)
+    selected = list(index['parent_projects'][:SELECTED_PROJECT_COUNT])
+    for name, filter_mode in zip(FILTER_STAGE_NAMES, core.FILTER_MODES):
+        def filter_rows(filter_mode=filter_mode):
+            positions = core.filter_positions(index, filter_mode, selected)
+            return df if positions is None else core.select_rows(df, positions)
+        df_filtered = measure(f"filter.{name}", filter_rows, n_rows, mode=filter_mode)
+        results[-1]["rows_out"] = len(df_filtered)
+
+    # 狀態追蹤
+    today = pd.Timestamp(datetime.now().date())
+    measure("status.classify", lambda: core.classify_tracking_status(df, today, core.UPCOMING_HORIZON_DAYS), n_rows)
+
+    # 建立圖表與序列化 (與介面相同：pio.to_json，標準 json 引擎，不再驗證)
+    # select_rows 會移除未使用的任務類別，圖表的列數才與選取的資料列一致 (head 會保留全部類別)
+    df_chart = core.select_rows(df, np.arange(min(len(df), FIGURE_MAX_ROWS)))
+    for render_engine in (core.RENDER_SVG, core.RENDER_WEBGL):
+        for name, color_mode in zip(COLOR_STAGE_NAMES, core.COLOR_MODES):
+            fig = measure(f"figure.{render_engine.lower()}.{name}",
+                          lambda: core.create_gantt_chart(df_chart, "每月", color_mode, render_engine), len(df_chart),
+                          mode=color_mode)
+        # 序列化最後建立的圖表 (依進度狀態區分顏色)
+        payload = measure(f"serialize.{render_engine.lower()}", lambda: pio.to_json(fig, validate=False, engine="json"), len(df_chart))
+        results[-1]["megabytes"] = round(len(payload) / 1024 ** 2, 2)
+    return results
+
+
+def compare(results, baseline_path):
+    """與先前的結果比較同一資料量、同一階段的耗時。"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["stage"], r["rows"]): r["seconds"] for r in json.load(f)["results"]}
+    print(f"\n與 {baseline_path} 比較 (目前 / 先前，> {REGRESSION_RATIO:.1f}x 標示為變慢)")
+    for r in results:
+        before = baseline.get((r["stage"], r["rows"]))
+        if before:
+            ratio = r["seconds"] / before
+            flag = "  變慢" if ratio > REGRESSION_RATIO else ""
+            print(f"  {r['stage']:32s} {r['rows']:>10,} 列 {before:9.4f} s → {r['seconds']:9.4f} s  {ratio:5.2f}x{flag}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="甘特圖效能測試套件，結果寫入 JSON。")
+    parser.add_argument("sizes", nargs="*", type=int, default=DEFAULT_SIZES, help="資料列數 (預設：1k / 10k / 100k)")
+    parser.add_argument("--seed", type=int, default=0, help="合成資料的亂數種子 (預設：0)")
+    parser.add_argument("--repeat", type=int, default=3, help="每個階段重複次數，取最短時間 (預設：3)")
+    parser.add_argument("-o", "--output", help="結果 JSON 路徑 (預設：benchmarks/results/<時間>.json)")
+    parser.add_argument("--compare", help="與先前的結果 JSON 比較")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    core = load_core()
+    report = dict(environment=environment(core, args), results=[])
+    for n_rows in args.sizes:
+        report["results"].extend(run_size(core, n_rows, args.seed, args.repeat))
+
+    output = args.output or RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}.json"
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n結果已寫入 {output}")
+
+    if args.compare:
+        compare(report["results"], args.compare)
+
+
+if __name__ == "__main__":
+    main()
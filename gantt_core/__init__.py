@@ -0,0 +1,50 @@
+"""
+甘特圖核心套件：讀取 → 預處理 → 篩選 → 建立圖表 → 狀態追蹤，不依賴 Streamlit，
+可直接用於批次作業與背景工作行程。Streamlit 介面 (202507-app.py) 只是建構於其上的外殼。
+
+子模組在第一次取用其中的名稱時才載入 (PEP 562)：只用到 options 中的常數時，
+不會連帶匯入 pandas 與 plotly，讓介面的首個畫面能更快出現。
+"""
+import importlib
+
+# --- 修改：改為延遲載入，子模組 -> 對外公開的名稱 ---
+_SUBMODULE_EXPORTS = {
+    'cache': ('LRUCache',),
+    'figure': (
+        'BAR_HOVER_TEMPLATE', 'COLOR_MODES', 'MILESTONE_HOVER_TEMPLATE', 'RENDER_AUTO', 'RENDER_SVG', 'RENDER_WEBGL',
+        'STATUS_COLOR_MAP', 'VIEW_MODES', 'WEBGL_TASK_THRESHOLD', 'add_bar_task_traces', 'add_milestone_trace',
+        'add_webgl_task_traces', 'apply_x_ticks', 'create_gantt_chart', 'figure_nbytes', 'get_dynamic_tick_format',
+        'recolor_task_bars', 'split_milestones',
+    ),
+    'filters': (
+        'FILTER_MODES', 'aggregate_projects', 'build_interval_index', 'build_project_type_index', 'filter_positions',
+        'UNASSIGNED_PROJECT_LABEL', 'page_tasks', 'query_interval_index', 'select_rows',
+    ),
+    'ingest': (
+        'file_format_for', 'load_tasks', 'pa', 'read_columnar_file', 'read_csv_in_chunks', 'read_csv_with_arrow',
+    ),
+    'options': ('COLUMNAR_FORMATS', 'ENGINE_ARROW', 'ENGINE_PANDAS', 'HAS_PYARROW'),
+    'preprocess': (
+        'DATE_COLUMNS', 'USED_COLUMNS', 'frame_memory_bytes', 'normalize_columns', 'order_tasks', 'preprocess_data',
+    ),
+    'status': (
+        'TRACKING_LABELS', 'TRACKING_LATE', 'TRACKING_ON_TIME', 'TRACKING_OTHER', 'TRACKING_OVERDUE',
+        'TRACKING_UPCOMING', 'UPCOMING_HORIZON_DAYS', 'classify_tracking_status',
+    ),
+}
+_EXPORT_MODULES = {name: module for module, names in _SUBMODULE_EXPORTS.items() for name in names}
+
+__all__ = sorted(_EXPORT_MODULES)
+
+
+def __getattr__(name):
+    module = _EXPORT_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # 之後的取用直接命中模組屬性，不再經過 __getattr__
+    return value
+
+
+def __dir__():
+    return __all__
@@ -0,0 +1,145 @@
+"""
+批次產生甘特圖：對目錄或萬用字元指定的多個專案檔案，以多個行程平行執行
+讀取 → 預處理 → 建立圖表，並各自輸出為獨立的 HTML 檔案。
+
+執行方式：
+    python -m gantt_core.batch programs/ "archive/**/*.csv" -o charts/ -j 8
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .figure import COLOR_MODES, RENDER_AUTO, RENDER_SVG, RENDER_WEBGL, VIEW_MODES, create_gantt_chart
+from .ingest import file_format_for, load_tasks, pa
+from .options import COLUMNAR_FORMATS, ENGINE_ARROW, ENGINE_PANDAS
+
+# 目錄中會被處理的副檔名 (欄式格式需要 pyarrow)
+INPUT_SUFFIXES = ('.csv',) + (tuple(f'.{ext}' for ext in COLUMNAR_FORMATS) if pa is not None else ())
+# plotly.js 的嵌入方式：inline 產生可離線開啟的完整檔案，cdn / directory 讓每個檔案小約 3.5 MB
+PLOTLYJS_MODES = ('inline', 'cdn', 'directory')
+
+
+def expand_inputs(patterns):
+    """
+    將命令列參數展開為檔案清單：目錄取其中支援的檔案，含萬用字元者以 glob 展開 (支援 **)，
+    其餘視為單一檔案。依出現順序排列並去除重複。
+    """
+    paths = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(str(path) for path in Path(pattern).iterdir() if path.suffix.lower() in INPUT_SUFFIXES)
+        elif glob.has_magic(pattern):
+            matches = sorted(glob.glob(pattern, recursive=True))
+        else:
+            matches = [pattern]
+        paths.extend(Path(match) for match in matches)
+    return list(dict.fromkeys(paths))
+
+
+def output_paths(paths, output_dir):
+    """每個輸入檔對應的 HTML 路徑；不同目錄下的同名檔案加上序號，避免互相覆寫。"""
+    seen, outputs = {}, []
+    for path in paths:
+        count = seen.get(path.stem, 0)
+        seen[path.stem] = count + 1
+        name = path.stem if count == 0 else f"{path.stem}-{count + 1}"
+        outputs.append(Path(output_dir) / f"{name}.html")
+    return outputs
+
+
+def init_worker():
+    """工作行程的初始化：檔案之間已由多個行程平行處理，pyarrow 只用單一執行緒，避免執行緒數超過核心數。"""
+    if pa is not None:
+        pa.set_cpu_count(1)
+
+
+def render_file(path, output_path, engine, view_mode, color_mode, render_engine, plotlyjs):
+    """
+    在工作行程中處理單一檔案並寫出 HTML，回傳 (輸入路徑, 輸出路徑, 資料列數, 耗時秒數, 錯誤訊息)。
+    例外不會拋出到主行程，而是以錯誤訊息回報，讓其他檔案繼續處理。
+    """
+    start = time.perf_counter()
+    try:
+        df = load_tasks(path.read_bytes(), engine, file_format_for(path.name))
+        if df.empty:
+            raise ValueError("檔案中沒有任何資料列")
+        fig = create_gantt_chart(df, view_mode, color_mode, render_engine)
+        fig.update_layout(title=f"專案時程甘特圖 - {path.stem}")
+        fig.write_html(output_path, include_plotlyjs=plotlyjs, full_html=True)
+        return path, output_path, len(df), time.perf_counter() - start, None
+    except Exception as e:
+        message = traceback.format_exception_only(type(e), e)[-1].strip()
+        return path, output_path, 0, time.perf_counter() - start, message
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m gantt_core.batch",
+        description="批次將專案檔案 (CSV / Parquet / Feather / Arrow) 轉為獨立的甘特圖 HTML 檔案。",
+    )
+    parser.add_argument("inputs", nargs="+", help="輸入檔案、目錄或萬用字元 (例如 'data/**/*.csv')")
+    parser.add_argument("-o", "--output-dir", default="gantt_html", help="HTML 輸出目錄 (預設：gantt_html)")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="平行處理的行程數 (預設：CPU 核心數)")
+    parser.add_argument("--engine", choices=[ENGINE_ARROW, "pandas"], default=ENGINE_ARROW if pa is not None else "pandas",
+                        help="CSV 解析引擎 (預設：已安裝 pyarrow 時使用 pyarrow)")
+    parser.add_argument("--view-mode", choices=VIEW_MODES, default="每月", help="時間軸視野 (預設：每月)")
+    parser.add_argument("--color-mode", choices=COLOR_MODES, default=COLOR_MODES[0], help="顏色模式")
+    parser.add_argument("--render-engine", choices=[RENDER_AUTO, RENDER_SVG, RENDER_WEBGL], default=RENDER_AUTO,
+                        help="繪圖引擎 (預設：自動)")
+    parser.add_argument("--plotlyjs", choices=PLOTLYJS_MODES, default="inline",
+                        help="plotly.js 的嵌入方式 (預設：inline，可離線開啟)")
+    args = parser.parse_args(argv)
+    if args.jobs < 1:
+        parser.error("--jobs 必須至少為 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("找不到任何輸入檔案。", file=sys.stderr)
+        return 2
+    os.makedirs(args.output_dir, exist_ok=True)
+    engine = ENGINE_ARROW if args.engine == ENGINE_ARROW else ENGINE_PANDAS
+
+    jobs = min(args.jobs, len(paths))
+    print(f"處理 {len(paths):,} 個檔案，{jobs} 個行程 → {args.output_dir}")
+    failures = []
+    wall_start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker if jobs > 1 else None) as pool:
+        futures = {
+            pool.submit(render_file, path, output_path, engine, args.view_mode, args.color_mode,
+                        args.render_engine, args.plotlyjs): path
+            for path, output_path in zip(paths, output_paths(paths, args.output_dir))
+        }
+        for future in as_completed(futures):
+            try:
+                path, output_path, n_rows, seconds, error = future.result()
+            except Exception as e:
+                # 工作行程異常結束 (例如記憶體不足被終止)，該檔案記為失敗
+                path, n_rows, seconds, error = futures[future], 0, 0.0, f"工作行程異常結束：{e!r}"
+            if error is None:
+                print(f"  完成  {seconds:7.2f} s  {n_rows:>10,} 列  {path} → {output_path}")
+            else:
+                print(f"  失敗  {seconds:7.2f} s  {path}：{error}")
+                failures.append((path, error))
+    wall_seconds = time.perf_counter() - wall_start
+
+    print(f"\n共 {len(paths):,} 個檔案：成功 {len(paths) - len(failures):,}，失敗 {len(failures):,}，"
+          f"總耗時 {wall_seconds:.2f} s")
+    if failures:
+        print("失敗的檔案：")
+        for path, error in failures:
+            print(f"  {path}：{error}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+"""
+以記憶體用量為上限的 LRU 快取，供介面層保存篩選結果、區間索引與圖表。
+"""
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    以記憶體用量為上限的 LRU 快取：總量超過 max_bytes 時，從最久未使用的項目開始淘汰。
+    size_of 用來估算每個值佔用的位元組數。
+    """
+
+    def __init__(self, max_bytes, size_of):
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.total_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, nbytes)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """取出快取值並標記為最近使用；不存在時回傳 None。"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value):
+        """存入快取值並回傳該值。單一值超過上限時不存入。"""
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        nbytes = self.size_of(value)
+        if nbytes > self.max_bytes:
+            return value
+        self._entries[key] = (value, nbytes)
+        self.total_bytes += nbytes
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted_bytes) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted_bytes
+        return value
@@ -0,0 +1,193 @@
+"""
+靜態圖檔匯出 (PNG / PDF / SVG)：以 kaleido 維持一個常駐的 Chrome 繪圖程式與多個繪圖分頁，
+多張圖表一次送出、由各分頁平行繪製，不必每張圖都重新啟動繪圖程式。
+
+kaleido (>= 1.0) 與本機安裝的 Chrome 為選用依賴。plotly.js 取自 plotly 套件內附的檔案、
+MathJax 停用，因此繪圖時不需連線網路。
+
+執行方式：
+    python -m gantt_core.export portfolio.csv -o reports/ --format pdf --per-project -n 4
+"""
+import argparse
+import contextlib
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from .batch import expand_inputs
+from .figure import COLOR_MODES, RENDER_SVG, VIEW_MODES, create_gantt_chart
+from .filters import build_project_type_index, positions_for_projects, select_rows
+from .ingest import file_format_for, load_tasks, pa
+from .options import ENGINE_ARROW, ENGINE_PANDAS
+
+# --- 新增：kaleido 為選用套件，未安裝時無法匯出圖檔 ---
+try:
+    import kaleido
+except ImportError:
+    kaleido = None
+
+EXPORT_FORMATS = ('png', 'pdf', 'svg')
+EXPORT_RENDERERS = max(1, min(4, os.cpu_count() or 1))  # 預設的常駐繪圖分頁數
+EXPORT_WIDTH = 1600           # 圖檔寬度 (像素)；高度沿用圖表依任務數計算的高度
+EXPORT_TIMEOUT_SECONDS = 300  # 單張圖的繪製逾時
+# 離線繪圖：不指定 plotlyjs 時 kaleido 使用 plotly 套件內附的 plotly.js；MathJax 預設從 CDN 載入，因此停用
+KALEIDO_OPTIONS = dict(mathjax=False)
+
+_pool_renderers = None  # 目前常駐的繪圖分頁數，None 表示尚未啟動
+
+
+def require_kaleido():
+    """確認可以匯出圖檔：需要 kaleido 與本機的 Chrome，缺少時以 RuntimeError 說明安裝方式。"""
+    if kaleido is None:
+        raise RuntimeError('圖檔匯出需要 kaleido 套件：pip install "kaleido>=1"')
+    try:
+        # 建構時只尋找 Chrome 執行檔，不會啟動瀏覽器
+        kaleido.Kaleido(n=1, **KALEIDO_OPTIONS)
+    except Exception as e:
+        raise RuntimeError(f"找不到 kaleido 可用的 Chrome，請先安裝 Chrome (或執行 plotly_get_chrome)：{e}") from e
+
+
+@contextlib.contextmanager
+def renderer_pool(renderers=EXPORT_RENDERERS):
+    """
+    啟動常駐的繪圖程式 (一個 Chrome、renderers 個分頁)，區塊內所有的 export_figures 呼叫共用，
+    離開區塊時關閉。外層已啟動時直接沿用外層的繪圖程式。
+    """
+    global _pool_renderers
+    if _pool_renderers is not None:
+        yield _pool_renderers
+        return
+
+    require_kaleido()
+    kaleido.start_sync_server(n=renderers, timeout=EXPORT_TIMEOUT_SECONDS, **KALEIDO_OPTIONS)
+    _pool_renderers = renderers
+    try:
+        yield renderers
+    finally:
+        kaleido.stop_sync_server(silence_warnings=True)
+        _pool_renderers = None
+
+
+def export_figures(figures, paths, width=EXPORT_WIDTH, scale=1):
+    """
+    將多張圖表一次交給繪圖程式，由各分頁平行繪製並寫入 paths (格式取自副檔名)。
+    未在 renderer_pool 區塊內呼叫時，會為這一批圖表臨時啟動一個繪圖程式。
+    回傳繪製失敗 (含逾時) 的 [(路徑, 錯誤訊息), ...]，全部成功時為空串列。
+    """
+    specs = [
+        dict(
+            fig=fig.to_dict(),
+            path=Path(path),
+            opts=dict(format=Path(path).suffix.lstrip('.'), width=width, height=fig.layout.height or 600, scale=scale),
+        )
+        for fig, path in zip(figures, paths)
+    ]
+    # 先移除舊的輸出檔：kaleido 繪製失敗時會刪除該檔，輸出後不存在的路徑即為失敗的圖
+    for spec in specs:
+        spec['path'].unlink(missing_ok=True)
+    with renderer_pool():
+        # 未設定 cancel_on_error 時，kaleido 不拋出例外，而是回傳各張圖的錯誤 (不含對應的路徑)
+        errors = kaleido.write_fig_from_object_sync(specs) or ()
+    failed = [spec['path'] for spec in specs if not spec['path'].exists()]
+    # 錯誤依完成順序回傳、無法逐一對應路徑，因此每個失敗的路徑都附上這一批的錯誤訊息
+    message = "；".join(dict.fromkeys(str(e) or type(e).__name__ for e in errors)) or "繪製失敗"
+    return [(path, message) for path in failed]
+
+
+def safe_file_name(name):
+    """將專案名稱轉為可用的檔名：路徑分隔符號與 Windows 不允許的字元改為底線。"""
+    return re.sub(r'[\\/:*?"<>|\s]+', '_', str(name)).strip('._') or 'project'
+
+
+def project_figures(df, view_mode, color_mode):
+    """每個母專案一張圖表 (只含該專案的列)，回傳 [(專案名稱, 圖表), ...]。"""
+    index = build_project_type_index(df)
+    figures = []
+    for project in index['parent_projects']:
+        fig = create_gantt_chart(select_rows(df, positions_for_projects(index, [project])), view_mode, color_mode, RENDER_SVG)
+        fig.update_layout(title=f"專案時程甘特圖 - {project}")
+        figures.append((project, fig))
+    return figures
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m gantt_core.export",
+        description="將專案檔案匯出為 PNG / PDF / SVG 甘特圖，可依母專案各自輸出一張。",
+    )
+    parser.add_argument("inputs", nargs="+", help="輸入檔案、目錄或萬用字元")
+    parser.add_argument("-o", "--output-dir", default="gantt_images", help="圖檔輸出目錄 (預設：gantt_images)")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="png", help="圖檔格式 (預設：png)")
+    parser.add_argument("--per-project", action="store_true", help="每個母專案各輸出一張圖 (存放於以檔名命名的子目錄)")
+    parser.add_argument("-n", "--renderers", type=int, default=EXPORT_RENDERERS,
+                        help=f"常駐的繪圖分頁數 (預設：{EXPORT_RENDERERS})")
+    parser.add_argument("--engine", choices=[ENGINE_ARROW, "pandas"], default=ENGINE_ARROW if pa is not None else "pandas",
+                        help="CSV 解析引擎 (預設：已安裝 pyarrow 時使用 pyarrow)")
+    parser.add_argument("--view-mode", choices=VIEW_MODES, default="每月", help="時間軸視野 (預設：每月)")
+    parser.add_argument("--color-mode", choices=COLOR_MODES, default=COLOR_MODES[0], help="顏色模式")
+    parser.add_argument("--width", type=int, default=EXPORT_WIDTH, help=f"圖檔寬度 (預設：{EXPORT_WIDTH})")
+    parser.add_argument("--scale", type=float, default=1, help="解析度倍率 (預設：1)")
+    args = parser.parse_args(argv)
+    if args.renderers < 1:
+        parser.error("--renderers 必須至少為 1")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("找不到任何輸入檔案。", file=sys.stderr)
+        return 2
+    try:
+        # 先確認繪圖環境，避免建立完所有圖表後才發現無法輸出
+        require_kaleido()
+    except RuntimeError as e:
+        print(e, file=sys.stderr)
+        return 2
+    engine = ENGINE_ARROW if args.engine == ENGINE_ARROW else ENGINE_PANDAS
+
+    # 先在主行程建立所有圖表，再一次交給繪圖程式平行輸出
+    start = time.perf_counter()
+    figures, outputs, failures = [], [], []
+    for path in paths:
+        try:
+            df = load_tasks(path.read_bytes(), engine, file_format_for(path.name))
+            if args.per_project:
+                output_dir = Path(args.output_dir) / path.stem
+                named = project_figures(df, args.view_mode, args.color_mode)
+            else:
+                output_dir = Path(args.output_dir)
+                named = [(path.stem, create_gantt_chart(df, args.view_mode, args.color_mode, RENDER_SVG))]
+            if not named:
+                raise ValueError("沒有可輸出的專案")
+        except Exception as e:
+            print(f"  失敗  {path}：{e}")
+            failures.append((path, e))
+            continue
+        os.makedirs(output_dir, exist_ok=True)
+        for name, fig in named:
+            figures.append(fig)
+            outputs.append(output_dir / f"{safe_file_name(name)}.{args.format}")
+    build_seconds = time.perf_counter() - start
+
+    if figures:
+        with renderer_pool(args.renderers):
+            start = time.perf_counter()
+            render_failures = export_figures(figures, outputs, width=args.width, scale=args.scale)
+            render_seconds = time.perf_counter() - start
+        for path, message in render_failures:
+            print(f"  失敗  {path}：{message}")
+            failures.append((path, message))
+        print(f"已輸出 {len(figures) - len(render_failures):,} 張圖 → {args.output_dir}：建立圖表 {build_seconds:.2f} s，"
+              f"繪製 {render_seconds:.2f} s ({args.renderers} 個繪圖分頁)")
+    if failures:
+        print(f"{len(failures):,} 個檔案或圖檔失敗。")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,342 @@
+"""
+甘特圖建構：X 軸刻度、顏色群組、SVG / WebGL 任務長條、里程碑與今日線。
+"""
+import functools
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.colors import qualitative
+
+# 時間軸視野與顏色模式
+VIEW_MODES = ("每日", "每周", "每月", "每季", "每半年", "每年")
+COLOR_MODES = ('依專案區分顏色', '依進度狀態區分顏色')
+
+# --- 新增：繪圖引擎設定 ---
+RENDER_AUTO = "自動"
+RENDER_SVG = "SVG"
+RENDER_WEBGL = "WebGL"
+WEBGL_TASK_THRESHOLD = 5_000  # 自動模式下，任務長條超過此數量時改用 WebGL 繪製
+
+# --- 新增：X 軸刻度上限，超過時依固定間隔抽稀 ---
+MAX_X_TICKS = 40
+TICK_CACHE_SIZE = 64          # 快取的刻度組合數 (日期範圍 x 時間軸視野)
+
+# 進度狀態的顏色
+STATUS_COLOR_MAP = {
+    'Closed': 'rgb(76, 175, 80)',      # 綠色
+    'In process': 'rgb(255, 152, 0)',  # 橘色
+    'Not start': 'rgb(189, 189, 189)', # 灰色
+    '未定義': 'rgb(158, 158, 158)'       # 深灰色
+}
+
+# 任務長條的懸停提示：長條的 base 為開始日期，x 為長條終點 (結束日期)
+BAR_HOVER_TEMPLATE = (
+    "<b>%{y}</b><br>"
+    "專案: %{customdata[0]}<br>"
+    "狀態: %{customdata[1]}<br>"
+    "開始: %{base|%Y-%m-%d}<br>"
+    "結束: %{x|%Y-%m-%d}"
+    "<extra></extra>" # 隱藏多餘的 trace name
+)
+
+# 里程碑的懸停提示，欄位由 customdata 提供
+MILESTONE_HOVER_TEMPLATE = (
+    "<b>%{y}</b><br>"
+    "日期: %{x|%Y-%m-%d}<br>"
+    "專案: %{customdata[0]}<br>"
+    "狀態: %{customdata[1]}"
+    "<extra></extra>"
+)
+
+# --- 新增：圖表軌跡的標記 (trace.meta)，切換顏色時用來找出長條與圖例軌跡 ---
+TASK_BARS_META = 'task_bars'
+COLOR_LEGEND_META = 'color_legend'
+LEGEND_MAX_ENTRIES = 100      # 圖例最多列出的顏色群組數 (專案數千個時圖例已無法閱讀，且每項都是一條軌跡)
+
+
+# --- 修改：支援全部六種時間軸視野，刻度以向量運算產生、超過上限時抽稀並快取 ---
+@functools.lru_cache(maxsize=TICK_CACHE_SIZE)
+def build_x_ticks(date_min, date_max, view_mode):
+    """
+    產生 [date_min, date_max] 之間的刻度位置與標籤 (皆為 tuple，可安全共用快取結果)。
+    第一個刻度對齊到 date_min 所在週期的起點；刻度數超過 MAX_X_TICKS 時每隔 step 個保留一個。
+    """
+    if view_mode == "每年":
+        ticks = pd.date_range(start=date_min.to_period('Y').to_timestamp(), end=date_max, freq='YS')
+        labels = ticks.strftime('%Y')
+    elif view_mode == "每半年":
+        ticks = pd.date_range(start=date_min.to_period('Y').to_timestamp(), end=date_max, freq='6MS')
+        labels = ticks.year.astype(str) + np.where(ticks.month <= 6, '-H1', '-H2')
+    elif view_mode == "每季":
+        ticks = pd.date_range(start=date_min.to_period('Q').to_timestamp(), end=date_max, freq='QS')
+        labels = ticks.year.astype(str) + '-Q' + ticks.quarter.astype(str)
+    elif view_mode == "每月":
+        ticks = pd.date_range(start=date_min.to_period('M').to_timestamp(), end=date_max, freq='MS')
+        labels = ticks.strftime('%Y-%m')
+    elif view_mode == "每周":
+        ticks = pd.date_range(start=date_min - pd.to_timedelta(date_min.weekday(), unit='d'), end=date_max, freq='W-MON')
+        labels = ticks.strftime('%Y-%m-%d')
+    elif view_mode == "每日":
+        ticks = pd.date_range(start=date_min, end=date_max, freq='D')
+        labels = ticks.strftime('%Y-%m-%d')
+    else:
+        return (), ()
+
+    step = max(1, -(-len(ticks) // MAX_X_TICKS))
+    return tuple(ticks[::step].strftime('%Y-%m-%d')), tuple(np.asarray(labels)[::step])
+
+def get_dynamic_tick_format(df, view_mode, x_range=None):
+    """
+    根據時間視野動態生成X軸的刻度位置與標籤。
+    有指定可見範圍 (x_range) 時只產生範圍內的刻度；日期取到日，重新執行時直接命中快取。
+    """
+    valid_starts = df['Start'].dropna()
+    valid_finishes = df['Finish'].dropna()
+    
+    if valid_starts.empty or valid_finishes.empty:
+        return None, None
+
+    date_min = valid_starts.min()
+    date_max = valid_finishes.max()
+    if x_range is not None:
+        date_min = max(date_min, pd.Timestamp(x_range[0]))
+        date_max = min(date_max, pd.Timestamp(x_range[1]))
+
+    tickvals, ticktext = build_x_ticks(date_min.normalize(), date_max.normalize(), view_mode)
+    if len(tickvals) == 0:
+        return None, None
+    return tickvals, ticktext
+
+def resolve_color_groups(tasks_df, color_mode):
+    """
+    依顏色模式將任務分組，回傳 [(組名, 顏色, 列位置), ...]，依各組首次出現的順序排列。
+    顏色的指派方式與 plotly.express 相同：先套用固定色表，其餘依目前範本的色盤循環取色。
+    """
+    if color_mode == '依進度狀態區分顏色':
+        column, val_map = 'Status', dict(STATUS_COLOR_MAP)
+    else:
+        column, val_map = 'Project', {}
+    sequence = list(pio.templates[pio.templates.default].layout.colorway or qualitative.D3)
+
+    codes, uniques = pd.factorize(tasks_df[column])
+    order = np.argsort(codes, kind='stable')
+    # 代碼 -1 (空值) 排在最前面，不屬於任何群組
+    offsets = np.r_[0, np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))] + np.count_nonzero(codes < 0)
+
+    groups = []
+    for i, name in enumerate(uniques):
+        if name not in val_map:
+            val_map[name] = sequence[len(val_map) % len(sequence)]
+        groups.append((name, val_map[name], order[offsets[i]:offsets[i + 1]]))
+    return groups
+
+def hover_status(tasks_df):
+    """懸停提示中的狀態文字：彙總列使用狀態組成 (StatusMix)，其餘使用 Status。"""
+    column = 'StatusMix' if 'StatusMix' in tasks_df.columns else 'Status'
+    return tasks_df[column].to_numpy(dtype=object)
+
+def to_epoch_ms(values):
+    """
+    將日期欄位轉為自 1970 年起的毫秒數 (float64)，NaT 轉為 NaN，可直接用於日期座標軸。
+    plotly 將數值陣列編碼為二進位 (base64) 型別陣列，每個值約 11 個字元，比 ISO 日期字串短。
+    """
+    values = np.asarray(values, dtype='datetime64[ms]')
+    return np.where(np.isnat(values), np.nan, values.astype(np.int64).astype(np.float64))
+
+# --- 新增：精簡的日期字串，縮小圖表 JSON ---
+def to_date_strings(values):
+    """
+    將日期陣列轉為精簡的 ISO 字串供圖表序列化：全部落在午夜時只輸出 YYYY-MM-DD，
+    否則精確到秒；NaT 轉為 None。用於長條起點 (base)：base 可接受任意型別，數值陣列也會被轉為
+    object 陣列、無法以型別陣列傳送，而日期字串比毫秒數短，懸停提示也能以 %{base|...} 直接格式化。
+    """
+    values = np.asarray(values, dtype='datetime64[s]')
+    valid = ~np.isnat(values)
+    at_midnight = (values[valid].astype(np.int64) % 86_400 == 0).all()
+    text = np.datetime_as_string(values, unit='D' if at_midnight else 's').astype(object)
+    text[~valid] = None
+    return text
+
+def add_webgl_task_traces(fig, tasks_df, color_mode, line_width):
+    """
+    以 WebGL (Scattergl) 繪製任務長條：每個顏色群組一條軌跡，每個任務為從開始到結束的粗線段，
+    線段之間以 NaN 斷開。懸停提示的欄位與 SVG 長條相同。
+    """
+    starts = tasks_df['Start'].to_numpy(dtype='datetime64[ms]')
+    finishes = tasks_df['Finish'].to_numpy(dtype='datetime64[ms]')
+    start_ms, finish_ms = to_epoch_ms(starts), to_epoch_ms(finishes)
+    tasks = tasks_df['Task'].to_numpy(dtype=object)
+    hover_info = np.column_stack([
+        tasks_df['Project'].to_numpy(dtype=object),
+        hover_status(tasks_df),
+        np.datetime_as_string(starts, unit='D'),
+        np.datetime_as_string(finishes, unit='D'),
+    ])
+
+    for name, color, positions in resolve_color_groups(tasks_df, color_mode):
+        n = len(positions)
+        x = np.full(3 * n, np.nan)
+        x[0::3], x[1::3] = start_ms[positions], finish_ms[positions]
+        y = np.full(3 * n, None, dtype=object)
+        y[0::3] = y[1::3] = tasks[positions]
+        customdata = np.full((3 * n, hover_info.shape[1]), None, dtype=object)
+        customdata[0::3] = customdata[1::3] = hover_info[positions]
+        fig.add_trace(go.Scattergl(
+            x=x, y=y, mode='lines', name=str(name), legendgroup=str(name),
+            line=dict(color=color, width=line_width),
+            customdata=customdata,
+            hovertemplate=(
+                "<b>%{y}</b><br>"
+                "專案: %{customdata[0]}<br>"
+                "狀態: %{customdata[1]}<br>"
+                "開始: %{customdata[2]}<br>"
+                "結束: %{customdata[3]}"
+                "<extra></extra>"
+            )
+        ))
+
+# --- 修改：SVG 長條合併為單一軌跡，顏色改由顏色代碼陣列決定，切換顏色時不需重建長條 ---
+def add_bar_task_traces(fig, tasks_df, color_mode):
+    """
+    直接以欄位陣列建立 SVG 任務長條 (取代 px.timeline)：所有任務共用一條水平 Bar 軌跡，
+    長條起點 (base) 為開始日期，長度為以毫秒計的工期，全部以 NumPy 向量運算產生。
+    起點以精簡日期字串傳送，工期為 float64 陣列，由 plotly 以二進位 (base64) 型別陣列編碼。
+    顏色與圖例由 recolor_task_bars 套用。
+    """
+    starts = tasks_df['Start'].to_numpy(dtype='datetime64[ms]')
+    durations = to_epoch_ms(tasks_df['Finish']) - to_epoch_ms(starts)
+    tasks = tasks_df['Task'].to_numpy(dtype=object)
+    hover_info = np.column_stack([
+        tasks_df['Project'].to_numpy(dtype=object),
+        hover_status(tasks_df),
+    ])
+
+    fig.add_trace(go.Bar(
+        base=to_date_strings(starts), x=durations, y=tasks,
+        orientation='h', name='任務', showlegend=False, meta=TASK_BARS_META, textposition='inside',
+        customdata=hover_info, hovertemplate=BAR_HOVER_TEMPLATE,
+    ))
+    # 圖例只是各顏色群組的示意：所有長條在同一條軌跡中，點擊無法隱藏單一群組，因此停用點擊 (介面上另有說明)
+    fig.update_layout(legend=dict(itemclick=False, itemdoubleclick=False))
+    recolor_task_bars(fig, tasks_df, color_mode)
+
+def recolor_task_bars(fig, tasks_df, color_mode):
+    """
+    依顏色模式替換 SVG 長條的顏色與圖例，不更動長條幾何。tasks_df 須與建立長條時的列順序相同。
+    每個長條的顏色以群組代碼 (int32 型別陣列) 搭配離散色階表示；沒有群組的空值列為透明。
+    圖表以 WebGL 繪製 (線段依顏色分軌) 時無法只換顏色，回傳 False。
+    """
+    bars = next((trace for trace in fig.data if trace.meta == TASK_BARS_META), None)
+    if bars is None:
+        return False
+
+    groups = resolve_color_groups(tasks_df, color_mode)
+    codes = np.full(len(tasks_df), len(groups), dtype=np.int32)
+    for code, (_, _, positions) in enumerate(groups):
+        codes[positions] = code
+    if groups:
+        colors = [color for _, color, _ in groups] + ['rgba(0, 0, 0, 0)']
+        bars.marker = dict(
+            color=codes, cmin=0, cmax=len(colors) - 1,
+            colorscale=[[i / (len(colors) - 1), color] for i, color in enumerate(colors)],
+        )
+    else:
+        # 沒有任何顏色群組 (例如只有里程碑，或母專案皆為空白)：色階至少需要兩種顏色，所有長條直接設為透明
+        bars.marker = dict(color='rgba(0, 0, 0, 0)')
+
+    # 圖例：每個顏色群組一條不含資料的軌跡，最多 LEGEND_MAX_ENTRIES 項
+    fig.data = [trace for trace in fig.data if trace.meta != COLOR_LEGEND_META]
+    fig.add_traces([
+        go.Bar(
+            x=[None], y=[None], orientation='h', name=str(name), marker=dict(color=color),
+            meta=COLOR_LEGEND_META, hoverinfo='skip',
+        )
+        for name, color, _ in groups[:LEGEND_MAX_ENTRIES]
+    ])
+    legend_title = '圖例' if len(groups) <= LEGEND_MAX_ENTRIES else f'圖例 (前 {LEGEND_MAX_ENTRIES} 項，共 {len(groups):,} 項)'
+    fig.update_layout(legend_title_text=legend_title)
+    return True
+
+def add_milestone_trace(fig, milestones_df, use_webgl=False):
+    """
+    以菱形標記繪製里程碑。懸停提示由 customdata 與 hovertemplate 在瀏覽器端組成，
+    不需逐列產生提示文字。
+    """
+    scatter_trace = go.Scattergl if use_webgl else go.Scatter
+    fig.add_trace(scatter_trace(
+        x=to_epoch_ms(milestones_df['Start']),
+        y=milestones_df['Task'].to_numpy(dtype=object),
+        mode='markers',
+        marker=dict(symbol='diamond', color='red', size=12, line=dict(color='black', width=1)),
+        name='里程碑', legendrank=2000,  # 排在顏色圖例之後
+        customdata=np.column_stack([
+            milestones_df['Project'].to_numpy(dtype=object),
+            milestones_df['Status'].to_numpy(dtype=object),
+        ]),
+        hovertemplate=MILESTONE_HOVER_TEMPLATE
+    ))
+
+# --- 修改：函式簽名，增加 color_mode 與 render_engine 參數 ---
+def create_gantt_chart(df, view_mode, color_mode, render_engine=RENDER_AUTO, x_range=None):
+    """
+    生成甘特圖，並可根據專案或進度狀態來區分顏色。資料為空時回傳空白圖表，由呼叫端提示使用者。
+    render_engine 為「自動」時，任務長條超過 WEBGL_TASK_THRESHOLD 個即改用 WebGL 繪製。
+    x_range 為目前的可見日期範圍，刻度只在此範圍內產生。
+    """
+    if df.empty:
+        return go.Figure()
+
+    tasks_df, milestones_df = split_milestones(df)
+
+    num_tasks = len(df['Task'].unique())
+    chart_height = max(600, num_tasks * 35)
+
+    use_webgl = render_engine == RENDER_WEBGL or (render_engine == RENDER_AUTO and len(tasks_df) > WEBGL_TASK_THRESHOLD)
+    # --- 修改：不經過 px.timeline，直接由欄位陣列建立圖表 ---
+    fig = go.Figure(layout=dict(title="專案時程甘特圖", xaxis_type='date', barmode='overlay', legend_tracegroupgap=0, legend_title_text='圖例'))
+    if use_webgl:
+        # --- 新增：WebGL 模式，線寬約為每列高度的七成，模擬長條的粗細 ---
+        add_webgl_task_traces(fig, tasks_df, color_mode, line_width=max(1, min(20, chart_height / max(num_tasks, 1) * 0.7)))
+    else:
+        add_bar_task_traces(fig, tasks_df, color_mode)
+
+    if not milestones_df.empty:
+        add_milestone_trace(fig, milestones_df, use_webgl)
+
+    fig.update_layout(
+        height=chart_height, xaxis_title="日期", yaxis_title="專案任務",
+        yaxis={'categoryorder':'array', 'categoryarray': df['Task'].cat.categories.tolist()},
+        title_font_size=24, font_size=14, hoverlabel=dict(bgcolor="white", font_size=12)
+    )
+    
+    today_date = datetime.now()
+    fig.add_shape(type="line", x0=today_date, y0=0, x1=today_date, y1=1, yref="paper", line=dict(color="Red", width=2, dash="dash"))
+    
+    apply_x_ticks(fig, df, view_mode, x_range)
+    return fig
+
+def split_milestones(df):
+    """將資料分為任務長條與里程碑兩個子集 (只讀取、不修改子集，因此不需要額外複製)。"""
+    is_milestone = (df['Type'] == '里程碑').to_numpy()
+    return df[~is_milestone], df[is_milestone]
+
+def apply_x_ticks(fig, df, view_mode, x_range=None):
+    """依時間軸視野設定 X 軸刻度；沒有刻度時交回 plotly 自動產生。"""
+    tickvals, ticktext = get_dynamic_tick_format(df, view_mode, x_range)
+    if tickvals is not None and ticktext is not None:
+        fig.update_xaxes(rangeslider_visible=True, tickmode='array', tickvals=tickvals, ticktext=ticktext)
+    else:
+        fig.update_xaxes(rangeslider_visible=True, tickmode='auto', tickvals=None, ticktext=None)
+
+def figure_nbytes(fig):
+    """估算圖表中各軌跡資料陣列佔用的位元組數，作為圖表快取的大小依據。"""
+    total = 0
+    for trace in fig.data:
+        for name in ('x', 'y', 'base', 'customdata'):
+            values = getattr(trace, name, None)
+            if values is not None:
+                total += np.asarray(values).nbytes
+    return total
@@ -0,0 +1,168 @@
+"""
+資料子集：專案/類型索引、篩選、時間區間索引、任務軸分頁與專案彙總 (LOD)。
+"""
+import numpy as np
+import pandas as pd
+
+# 篩選模式
+FILTER_MODES = ("顯示全部專案", "只顯示母專案", "依母專案篩選")
+
+# --- 新增：彙總檢視中，專案名稱為空的任務收合成的列名 ---
+UNASSIGNED_PROJECT_LABEL = "未指定專案"
+
+
+def build_project_type_index(df):
+    """
+    以 (專案, 類型) 建立列位置索引：將列位置依 (專案, 類型) 的類別代碼穩定排序，
+    每個群組對應排序後陣列 order 中的一段連續區間 [start, stop)。
+    同一專案的各類型群組相鄰，因此每個專案也對應一段連續區間。
+    """
+    projects = df['Project'].cat.categories
+    types = df['Type'].cat.categories
+    # 類別代碼 -1 代表空值，+1 後讓空值也成為獨立的群組
+    project_codes = df['Project'].cat.codes.to_numpy().astype(np.int64) + 1
+    type_codes = df['Type'].cat.codes.to_numpy().astype(np.int64) + 1
+    keys = project_codes * (len(types) + 1) + type_codes
+
+    order = np.argsort(keys, kind='stable')
+    sorted_keys = keys[order]
+    starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+    stops = np.r_[starts[1:], len(sorted_keys)]
+
+    groups, project_ranges = {}, {}
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        project_code, type_code = divmod(int(sorted_keys[start]), len(types) + 1)
+        task_type = types[type_code - 1] if type_code else None
+        if project_code == 0:
+            # 專案名稱為空的列不屬於任何專案，但仍計入依類型的篩選 (例如「只顯示母專案」)
+            groups[(None, task_type)] = (start, stop)
+            continue
+        project = projects[project_code - 1]
+        groups[(project, task_type)] = (start, stop)
+        first_start = project_ranges.get(project, (start, stop))[0]
+        project_ranges[project] = (first_start, stop)
+
+    return {
+        'order': order,
+        'groups': groups,
+        'projects': project_ranges,
+        # 有「母專案」列的專案，依資料集中的順序排列，作為篩選選項
+        'parent_projects': [project for project in project_ranges if (project, '母專案') in groups],
+    }
+
+def positions_for_type(index, task_type):
+    """回傳所有專案中指定類型的列位置 (遞增排序)。"""
+    order = index['order']
+    slices = [order[start:stop] for (_, group_type), (start, stop) in index['groups'].items() if group_type == task_type]
+    return np.sort(np.concatenate(slices)) if slices else np.array([], dtype=np.intp)
+
+def positions_for_projects(index, projects):
+    """回傳所選專案的所有列位置 (遞增排序)。"""
+    order = index['order']
+    slices = [order[slice(*index['projects'][project])] for project in projects if project in index['projects']]
+    return np.sort(np.concatenate(slices)) if slices else np.array([], dtype=np.intp)
+
+def filter_positions(index, filter_mode, selected_projects=()):
+    """
+    依篩選模式回傳要保留的列位置 (遞增排序)；「顯示全部專案」回傳 None，代表沿用整個資料集。
+    """
+    if filter_mode == "顯示全部專案":
+        return None
+    if filter_mode == "只顯示母專案":
+        return positions_for_type(index, '母專案')
+    return positions_for_projects(index, selected_projects)
+
+def select_rows(df, positions):
+    """
+    依列位置取出資料子集，並移除子集中未使用的任務類別。
+    positions 為 None 時直接回傳原資料集本身，不做任何複製。
+    """
+    if positions is None:
+        return df
+    subset = df.take(positions)
+    subset['Task'] = subset['Task'].cat.remove_unused_categories()
+    return subset
+
+def build_interval_index(df):
+    """
+    建立時間區間索引：依開始日期排序的列位置、對應的開始/結束時間 (int64 奈秒) 與最長工期，
+    供 query_interval_index 以二分搜尋找出與可見範圍相交的列。
+    沒有開始日期的列不會被繪製，因此不納入索引；沒有結束日期的列 (如里程碑) 以開始日期作為結束。
+    """
+    starts = df['Start'].to_numpy(dtype='datetime64[ns]')
+    finishes = df['Finish'].to_numpy(dtype='datetime64[ns]')
+    finishes = np.where(np.isnat(finishes), starts, finishes)
+    valid = np.flatnonzero(~np.isnat(starts))
+    order = valid[np.argsort(starts[valid], kind='stable')]
+    start_ns = starts[order].astype(np.int64)
+    finish_ns = finishes[order].astype(np.int64)
+    return {
+        'order': order,
+        'starts': start_ns,
+        'finishes': finish_ns,
+        'max_span': max(int((finish_ns - start_ns).max()), 0) if len(order) else 0,
+    }
+
+def query_interval_index(index, range_start, range_end):
+    """
+    回傳與 [range_start, range_end] 相交的列位置 (遞增排序)。
+    開始時間早於 range_start - 最長工期 的列不可能相交，因此只需檢查二分搜尋後的候選區段。
+    """
+    lo, hi = pd.Timestamp(range_start).value, pd.Timestamp(range_end).value
+    first = np.searchsorted(index['starts'], lo - index['max_span'], side='left')
+    last = np.searchsorted(index['starts'], hi, side='right')
+    hits = first + np.flatnonzero(index['finishes'][first:last] >= lo)
+    return np.sort(index['order'][hits])
+
+def page_tasks(df, page, page_size):
+    """
+    任務軸分頁：依 Task 類別的順序 (即 y 軸順序) 取第 page 頁 (從 1 起算) 的任務，
+    回傳只含這些任務列的資料子集。
+    """
+    first = (page - 1) * page_size
+    codes = df['Task'].cat.codes.to_numpy()
+    return select_rows(df, np.flatnonzero((codes >= first) & (codes < first + page_size)))
+
+def aggregate_projects(df, expanded_projects=()):
+    """
+    細節層級 (LOD) 彙總：未展開的專案收合為一列彙總長條 (最早開始、最晚結束)，
+    Status 取該專案最多的狀態以便上色，StatusMix 記錄各狀態的筆數；
+    expanded_projects 中的專案保留原本的任務列。繪製的列數因此與專案數相關，而非任務數。
+    專案名稱為空的列同樣收合為一列 (Project 維持空值，列名為 UNASSIGNED_PROJECT_LABEL)。
+    """
+    is_expanded = df['Project'].isin(expanded_projects).to_numpy()
+    collapsed = df[~is_expanded]
+    detail = df[is_expanded]
+
+    # dropna=False：專案名稱為空的列也收合為一組，不會從彙總檢視中消失
+    spans = collapsed.groupby('Project', observed=True, dropna=False).agg(
+        Start=('Start', 'min'), Finish=('Finish', 'max'), Count=('Task', 'size')
+    )
+    status_counts = (
+        collapsed.groupby(['Project', 'Status'], observed=True, dropna=False).size()
+        .unstack(fill_value=0)
+        .reindex(spans.index, fill_value=0)
+    )
+    summary = pd.DataFrame({
+        'Task': [
+            f"{UNASSIGNED_PROJECT_LABEL if pd.isna(project) else project} (彙總 {count:,} 項)"
+            for project, count in zip(spans.index, spans['Count'])
+        ],
+        'Project': spans.index.astype(object),
+        'Type': '母專案',
+        'Status': status_counts.idxmax(axis=1).astype(object).to_numpy(),
+        'StatusMix': [
+            " / ".join(f"{status} {n:,}" for status, n in counts.items() if n)
+            for counts in status_counts.to_dict('records')
+        ],
+        'Start': spans['Start'].to_numpy(),
+        'Finish': spans['Finish'].to_numpy(),
+    })
+    detail = detail.astype({'Task': object, 'Project': object, 'Type': object, 'Status': object})
+    detail['StatusMix'] = detail['Status']
+
+    # 依專案排序 (穩定排序保留各專案內原本的任務順序)，彙總列與展開的任務列交錯排列
+    combined = pd.concat([summary, detail[summary.columns]], ignore_index=True)
+    combined = combined.sort_values('Project', kind='stable', ignore_index=True)
+    combined['Task'] = pd.Categorical(combined['Task'], categories=combined['Task'].unique(), ordered=True)
+    return combined
@@ -0,0 +1,174 @@
+"""
+讀取專案檔案：pandas 分塊串流讀取 CSV，或在安裝 pyarrow 時以 Arrow 讀取 CSV / Parquet / Feather / Arrow IPC。
+"""
+import io
+
+import numpy as np
+import pandas as pd
+
+from .options import COLUMNAR_FORMATS, ENGINE_ARROW
+from .preprocess import (
+    DATE_COLUMNS, DATE_SAMPLE_SIZE, USED_COLUMNS, coerce_dates_slowly, concat_chunks,
+    detect_date_format, frame_memory_bytes, normalize_columns, order_tasks,
+)
+
+# --- 新增：pyarrow 為選用套件，未安裝時退回 pandas 分塊讀取 ---
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.feather as pa_feather
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+# 一律以字串讀取的文字欄位 (不讓解析器把純數字的代號推斷為數值)
+TEXT_COLUMNS = ['Task', 'Project', 'Type', 'Status']
+
+# --- 新增：分塊讀取設定 ---
+CSV_CHUNK_SIZE = 100_000      # 每次讀入的列數
+
+
+def read_csv_in_chunks(file_bytes, chunk_size=CSV_CHUNK_SIZE, progress_callback=None):
+    """
+    分塊串流讀取 CSV：每塊只保留程式會用到的欄位，並立即完成日期與狀態的轉換，
+    記憶體峰值約為單一區塊加上已轉換完成的精簡結果。
+    progress_callback 會收到 0~1 之間的讀取進度。
+    """
+    buffer = io.BytesIO(file_bytes)
+    total_bytes = max(len(file_bytes), 1)
+    # 文字與日期欄位一律以字串讀取，避免各區塊各自推斷出不同型別 (例如純數字的專案代號)；
+    # 日期交由 normalize_columns 偵測格式，YYYYMMDD 這類純數字日期才不會被當成整數
+    text_dtypes = {col: str for col in TEXT_COLUMNS + DATE_COLUMNS}
+    reader = pd.read_csv(buffer, chunksize=chunk_size, usecols=lambda col: col in USED_COLUMNS, dtype=text_dtypes)
+
+    chunks = []
+    memory_before = 0
+    date_formats = {}  # 第一個區塊偵測出的日期格式，後續區塊沿用
+    coerced_dates = {}
+    with reader:
+        for chunk in reader:
+            memory_before += frame_memory_bytes(chunk)
+            chunk = normalize_columns(chunk, date_formats)
+            for col, coerced in chunk.attrs['coerced_dates'].items():
+                coerced_dates[col] = coerced_dates.get(col, 0) + coerced
+            chunks.append(chunk)
+            if progress_callback is not None:
+                progress_callback(min(buffer.tell() / total_bytes, 1.0))
+
+    if not chunks:
+        return normalize_columns(pd.DataFrame(columns=USED_COLUMNS))
+    df = concat_chunks(chunks)
+    del chunks
+    df.attrs['memory_before'] = memory_before
+    df.attrs['coerced_dates'] = coerced_dates
+    return df
+
+def _arrow_string_mapper(arrow_type):
+    """to_pandas 的型別對應：文字欄位保留為 Arrow 字串，其餘沿用預設轉換。"""
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+def read_csv_with_arrow(file_bytes):
+    """
+    以 pyarrow 的多執行緒 CSV 解析器讀取檔案：只轉換用到的欄位，
+    日期欄位以偵測出的格式直接解析為 timestamp，文字欄位保留為 Arrow 字串。
+    不符合該格式的日期才逐筆轉換，無法辨識者為 NaT。
+    """
+    header = pa_csv.open_csv(io.BytesIO(file_bytes)).schema.names
+    columns = [col for col in USED_COLUMNS if col in header]
+    table = pa_csv.read_csv(
+        io.BytesIO(file_bytes),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            # 日期欄位先讀為字串再以偵測出的格式解析；文字欄位與 pandas 路徑一致一律為字串 (保留 "007" 之類的前導零)
+            column_types={col: pa.string() for col in TEXT_COLUMNS + DATE_COLUMNS if col in columns},
+            strings_can_be_null=True,
+        ),
+    )
+
+    df = table.drop_columns([col for col in DATE_COLUMNS if col in columns]).to_pandas(types_mapper=_arrow_string_mapper)
+    coerced_dates = {}
+    for col in DATE_COLUMNS:
+        if col not in columns:
+            continue
+        raw = table[col]
+        non_null = pc.drop_null(raw)
+        sample_idx = np.linspace(0, len(non_null) - 1, min(len(non_null), DATE_SAMPLE_SIZE)).astype(int)
+        date_format = detect_date_format(non_null.take(sample_idx).to_pandas())
+        if date_format is not None:
+            parsed = pc.strptime(raw, format=date_format, unit='s', error_is_null=True)
+        else:
+            parsed = pa.nulls(len(raw), pa.timestamp('s'))
+        dates = pd.Series(parsed.to_numpy(zero_copy_only=False), index=df.index).astype('datetime64[ns]')
+        failed = pc.and_(pc.is_valid(raw), pc.is_null(parsed)).to_numpy(zero_copy_only=False)
+        if failed.any():
+            dates[failed] = coerce_dates_slowly(raw.to_pandas()[failed])
+        coerced_dates[col] = int((dates.isna().to_numpy() & pc.is_valid(raw).to_numpy(zero_copy_only=False)).sum())
+        df[col] = dates
+
+    df = df[columns]
+    df.attrs['coerced_dates'] = coerced_dates
+    memory_before = frame_memory_bytes(df)
+    df = normalize_columns(df)
+    df.attrs['memory_before'] = memory_before
+    return df
+
+def read_columnar_file(file_bytes, file_format):
+    """
+    讀取 Parquet / Feather / Arrow IPC 檔案：只載入用到的欄位，
+    已是 timestamp 或字典編碼 (類別) 的欄位直接沿用，不經過文字解析。
+    """
+    buffer = io.BytesIO(file_bytes)
+    if file_format == 'parquet':
+        names = pq.ParquetFile(buffer).schema_arrow.names
+        table = pq.read_table(buffer, columns=[col for col in USED_COLUMNS if col in names])
+    else:
+        try:
+            reader = pa.ipc.open_file(buffer)
+        except pa.ArrowInvalid:
+            # 非 IPC 檔案格式時改以串流格式讀取
+            buffer.seek(0)
+            reader = pa.ipc.open_stream(buffer)
+        names = reader.schema.names
+        if isinstance(reader, pa.ipc.RecordBatchFileReader):
+            table = pa_feather.read_table(io.BytesIO(file_bytes), columns=[col for col in USED_COLUMNS if col in names])
+        else:
+            table = reader.read_all().select([col for col in USED_COLUMNS if col in names])
+
+    # date32/date64 轉為 timestamp；含時區的 timestamp 保留時區，由 enforce_task_schema 取當地時間去除時區
+    # (在 Arrow 端直接 cast 會取 UTC 時間，台北午夜的日期會變成前一天)
+    for col in DATE_COLUMNS:
+        if col in table.column_names and pa.types.is_date(table.schema.field(col).type):
+            table = table.set_column(table.schema.get_field_index(col), col, table[col].cast(pa.timestamp('us')))
+
+    df = table.to_pandas(types_mapper=_arrow_string_mapper)
+    memory_before = frame_memory_bytes(df)
+    df = normalize_columns(df)
+    df.attrs['memory_before'] = memory_before
+    return df
+
+def file_format_for(file_name):
+    """依副檔名判斷檔案格式：欄式格式回傳 COLUMNAR_FORMATS 中的格式，其餘視為 CSV。"""
+    return COLUMNAR_FORMATS.get(file_name.rsplit('.', 1)[-1].lower(), 'csv')
+
+def load_tasks(file_bytes, engine=ENGINE_ARROW, file_format='csv', progress_callback=None):
+    """
+    讀取檔案並完成預處理，回傳排序後的任務表。
+    欄式格式一律以 pyarrow 讀取；CSV 依 engine 選擇 pyarrow (已安裝時) 或 pandas 分塊串流，
+    progress_callback 只在分塊讀取時收到 0~1 之間的讀取進度。
+    """
+    if file_format in COLUMNAR_FORMATS.values():
+        df = read_columnar_file(file_bytes, file_format)
+    elif engine == ENGINE_ARROW and pa is not None:
+        df = read_csv_with_arrow(file_bytes)
+    else:
+        df = read_csv_in_chunks(file_bytes, progress_callback=progress_callback)
+
+    attrs = dict(df.attrs)
+    df = order_tasks(df)
+    # 保留讀取階段的統計 (無法解析的日期筆數、套用欄位型別前後的記憶體用量)，供頁面顯示
+    df.attrs.update(attrs)
+    df.attrs['memory_after'] = frame_memory_bytes(df)
+    return df
@@ -0,0 +1,15 @@
+"""
+上傳畫面用到的選項常數。本模組不匯入任何第三方套件，介面在使用者上傳檔案之前
+只需載入本模組，pandas / plotly 等較重的模組延後到實際處理資料時才載入。
+"""
+from importlib.util import find_spec
+
+# --- 新增：解析引擎選項 ---
+ENGINE_PANDAS = "pandas (分塊串流)"
+ENGINE_ARROW = "pyarrow"
+
+# --- 新增：可讀取的檔案格式 (副檔名 -> 格式)，欄式格式需要 pyarrow ---
+COLUMNAR_FORMATS = {'parquet': 'parquet', 'pq': 'parquet', 'feather': 'feather', 'arrow': 'arrow', 'ipc': 'arrow'}
+
+# 只檢查 pyarrow 是否已安裝，不實際匯入 (匯入約需 0.1 秒以上)
+HAS_PYARROW = find_spec("pyarrow") is not None
@@ -0,0 +1,172 @@
+"""
+任務表的欄位型別宣告與預處理：日期解析、狀態欄位正規化、排序與精簡型別。
+"""
+import numpy as np
+import pandas as pd
+
+DATE_COLUMNS = ['Start', 'Finish', 'Completion_Date']
+# 程式實際會使用的欄位，其餘欄位在讀取時即略過
+USED_COLUMNS = ['Task', 'Project', 'Type', 'Status'] + DATE_COLUMNS
+
+# --- 新增：日期格式偵測設定 ---
+# 依序嘗試的候選格式，第一個為說明文字要求的 YYYY-MM-DD
+DATE_FORMAT_CANDIDATES = [
+    '%Y-%m-%d', '%Y/%m/%d', '%Y-%m-%d %H:%M:%S', '%Y/%m/%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S',
+    '%Y%m%d', '%m/%d/%Y', '%d/%m/%Y', '%d.%m.%Y',
+]
+DATE_SAMPLE_SIZE = 200        # 偵測格式時抽樣的筆數
+
+# --- 新增：任務表的欄位型別宣告，讀取時即轉換為精簡型別 ---
+TASK_SCHEMA = {
+    'Task': 'category',
+    'Project': 'category',
+    'Type': 'category',
+    'Status': 'category',
+    'TypeOrder': 'int8',
+    'Start': 'datetime64[ns]',
+    'Finish': 'datetime64[ns]',
+    'Completion_Date': 'datetime64[ns]',
+}
+
+
+def frame_memory_bytes(df):
+    """DataFrame 實際佔用的記憶體 (位元組)，包含字串物件本身。"""
+    return int(df.memory_usage(deep=True).sum())
+
+def enforce_task_schema(df):
+    """
+    依 TASK_SCHEMA 轉換欄位型別：文字欄位改為類別、日期欄位統一為 datetime64。
+    含時區的日期保留當地時間並去除時區。已符合宣告的欄位 (例如已排序的 Task 類別) 保持不變。
+    """
+    for col, dtype in TASK_SCHEMA.items():
+        if col not in df.columns:
+            continue
+        if dtype == 'category':
+            if not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype('category')
+            continue
+        if isinstance(df[col].dtype, pd.DatetimeTZDtype):
+            df[col] = df[col].dt.tz_localize(None)
+        if df[col].dtype != dtype:
+            df[col] = df[col].astype(dtype)
+    return df
+
+def concat_chunks(chunks):
+    """
+    合併分塊讀取的結果。各塊的類別欄位先對齊為相同的類別集合，
+    避免 pd.concat 因類別不一致而退回 object 型別。
+    """
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            # 整欄皆為空值的區塊沒有類別，其類別型別可能不同，合併時略過
+            non_empty = [chunk[col] for chunk in chunks if len(chunk[col].cat.categories)]
+            if not non_empty:
+                continue
+            categories = pd.api.types.union_categoricals(non_empty).categories
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+def detect_date_format(values):
+    """
+    從欄位中均勻抽樣非空值，回傳能解析最多樣本的候選日期格式；皆無法解析時回傳 None。
+    """
+    sample = values.dropna()
+    if len(sample) > DATE_SAMPLE_SIZE:
+        sample = sample.iloc[np.linspace(0, len(sample) - 1, DATE_SAMPLE_SIZE).astype(int)]
+    sample = sample.astype(str)
+
+    best_format, best_hits = None, 0
+    for date_format in DATE_FORMAT_CANDIDATES:
+        hits = int(pd.to_datetime(sample, format=date_format, errors='coerce').notna().sum())
+        if hits > best_hits:
+            best_format, best_hits = date_format, hits
+        if hits == len(sample):
+            break
+    return best_format
+
+def coerce_dates_slowly(values):
+    """逐筆推斷格式的慢速轉換，只用於明確格式解析失敗的少數資料列，無法辨識者為 NaT。"""
+    return pd.to_datetime(values.map(lambda value: pd.to_datetime(value, errors='coerce')), errors='coerce')
+
+def parse_date_column(values, date_format=None):
+    """
+    以單一明確格式快速解析整欄日期 (未指定時先抽樣偵測)，解析失敗的列才改走慢速路徑。
+    回傳 (解析結果, 使用的格式, 無法解析而轉為 NaT 的筆數)。
+    """
+    if not (pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values)):
+        parsed = pd.to_datetime(values, errors='coerce')
+        return parsed, date_format, int((parsed.isna() & values.notna()).sum())
+
+    if date_format is None:
+        date_format = detect_date_format(values)
+    if date_format is not None:
+        parsed = pd.to_datetime(values, format=date_format, errors='coerce')
+    else:
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+
+    failed = parsed.isna() & values.notna()
+    if failed.any():
+        parsed[failed] = coerce_dates_slowly(values[failed])
+    return parsed, date_format, int((parsed.isna() & values.notna()).sum())
+
+def normalize_columns(df, date_formats=None):
+    """
+    欄位正規化：轉換日期格式、處理狀態欄位。可逐塊套用於分塊讀取的資料。
+    date_formats 為「欄位 -> 日期格式」的字典，未記錄的欄位會偵測後寫回，
+    讓後續區塊沿用同一格式。無法解析的日期筆數記錄於 df.attrs['coerced_dates']。
+    """
+    if date_formats is None:
+        date_formats = {}
+    coerced_dates = dict(df.attrs.get('coerced_dates', {}))
+
+    # 轉換日期格式
+    for col in DATE_COLUMNS:
+        if col in df.columns and not pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col], date_formats[col], coerced = parse_date_column(df[col], date_formats.get(col))
+            coerced_dates[col] = coerced_dates.get(col, 0) + coerced
+    df.attrs['coerced_dates'] = coerced_dates
+
+    # --- 新增：處理 Status 欄位 ---
+    if 'Status' in df.columns:
+        # 將空白的狀態值填補為'未定義' (類別型欄位需先加入此類別)
+        if isinstance(df['Status'].dtype, pd.CategoricalDtype) and '未定義' not in df['Status'].cat.categories:
+            df['Status'] = df['Status'].cat.add_categories('未定義')
+        df['Status'] = df['Status'].fillna('未定義')
+    else:
+        # 如果沒有 Status 欄位，則新增一個並全部設為'未定義'
+        df['Status'] = '未定義'
+
+    return enforce_task_schema(df)
+
+def order_tasks(df):
+    """
+    建立排序鍵並排序，將任務名稱設定為有序的 Categorical。
+    """
+    # 建立排序邏輯
+    type_order = {'母專案': 1, '子專案': 2, '里程碑': 3}
+    df['TypeOrder'] = df['Type'].map(type_order).astype('float64').fillna(4).astype('int8')
+
+    # 類別型的排序鍵依類別順序排序，先將類別改為字母順序，與文字欄位的排序結果一致
+    for col in ['Project', 'Type']:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+
+    # 排序
+    df = df.sort_values(by=['Project', 'TypeOrder', 'Start'], ascending=[True, True, True]).reset_index(drop=True)
+
+    # 將任務名稱設定為 Categorical
+    df['Task'] = pd.Categorical(df['Task'], categories=df['Task'].unique(), ordered=True)
+    
+    return enforce_task_schema(df)
+
+def preprocess_data(df):
+    """
+    資料預處理：轉換日期格式、建立排序鍵、處理狀態欄位。
+    """
+    memory_before = frame_memory_bytes(df)
+    df = normalize_columns(df)
+    attrs = dict(df.attrs, memory_before=memory_before)
+    df = order_tasks(df)
+    df.attrs.update(attrs)
+    return df
@@ -0,0 +1,36 @@
+"""
+狀態追蹤：將任務分類為即將到期、已逾期、準時完成與延遲完成。
+"""
+import numpy as np
+
+# --- 新增：狀態追蹤設定 ---
+UPCOMING_HORIZON_DAYS = 7                  # 預設的「即將到期」天數範圍
+# 狀態分類代碼與名稱：其他 (未完成且未進入到期範圍，或日期不完整)、即將到期、已逾期、準時完成、延遲完成
+TRACKING_OTHER, TRACKING_UPCOMING, TRACKING_OVERDUE, TRACKING_ON_TIME, TRACKING_LATE = range(5)
+TRACKING_LABELS = ('其他', '即將到期', '已逾期', '準時完成', '延遲完成')
+
+
+# --- 新增：狀態追蹤引擎 ---
+def classify_tracking_status(df, today, horizon_days=UPCOMING_HORIZON_DAYS):
+    """
+    以單次向量運算將每一列分類為 TRACKING_* 代碼 (int8)：
+    未完成者依預計結束日分為即將到期 (今天起 horizon_days 天內) 或已逾期，
+    已完成者依實際遞交日是否晚於預計結束日分為準時完成或延遲完成。各分類互斥，不需再去除重複。
+    """
+    finish = df['Finish'].to_numpy(dtype='datetime64[ns]')
+    completion = df['Completion_Date'].to_numpy(dtype='datetime64[ns]')
+    is_open = np.isnat(completion)
+    is_closed = ~is_open & ~np.isnat(finish)
+    today = np.datetime64(today, 'ns')
+    horizon_end = today + np.timedelta64(horizon_days, 'D')
+    # 與 NaT 的比較一律為 False，缺少預計結束日的未完成項目歸為「其他」
+    return np.select(
+        [
+            is_open & (finish >= today) & (finish <= horizon_end),
+            is_open & (finish < today),
+            is_closed & (completion <= finish),
+            is_closed & (completion > finish),
+        ],
+        [TRACKING_UPCOMING, TRACKING_OVERDUE, TRACKING_ON_TIME, TRACKING_LATE],
+        default=TRACKING_OTHER,
+    ).astype(np.int8)
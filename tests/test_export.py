@@ -0,0 +1,30 @@
+"""
+圖檔匯出的回歸測試：以替代的 kaleido 呼叫模擬繪製失敗，不需要 Chrome。
+"""
+import pytest
+
+from gantt_core import export
+
+CSV = "Task,Project,Type,Start,Finish,Status\nA,P1,母專案,2025-01-01,2025-01-05,Closed\nB,P2,母專案,2025-01-02,2025-01-06,Closed\n"
+
+
+def test_render_failures_are_reported(tmp_path, monkeypatch, capsys):
+    if export.kaleido is None:
+        pytest.skip("未安裝 kaleido")
+    (tmp_path / "portfolio.csv").write_text(CSV, encoding="utf-8")
+
+    def write_first_only(specs):
+        # 第一張圖寫入成功，其餘與 kaleido 相同：刪除輸出檔並回傳錯誤
+        specs[0]['path'].write_bytes(b"png")
+        return (TimeoutError("render timed out"),)
+
+    monkeypatch.setattr(export, "require_kaleido", lambda: None)
+    monkeypatch.setattr(export.kaleido, "start_sync_server", lambda **kwargs: None)
+    monkeypatch.setattr(export.kaleido, "stop_sync_server", lambda **kwargs: None)
+    monkeypatch.setattr(export.kaleido, "write_fig_from_object_sync", write_first_only)
+
+    output_dir = tmp_path / "out"
+    assert export.main([str(tmp_path / "portfolio.csv"), "-o", str(output_dir), "--per-project", "--engine", "pandas"]) == 1
+    out = capsys.readouterr().out
+    assert f"失敗  {output_dir / 'portfolio' / 'P2.png'}：render timed out" in out
+    assert "已輸出 1 張圖" in out
@@ -0,0 +1,44 @@
+"""
+圖表建構的回歸測試。
+"""
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import pytest
+
+from gantt_core import RENDER_SVG, create_gantt_chart, preprocess_data
+
+
+def make_tasks(types, projects=None):
+    n = len(types)
+    return preprocess_data(pd.DataFrame({
+        'Task': [f'T{i}' for i in range(n)],
+        'Project': projects if projects is not None else ['P1'] * n,
+        'Type': types,
+        'Start': ['2025-01-01'] * n,
+        'Finish': ['2025-01-31'] * n,
+        'Status': ['Closed'] * n,
+    }))
+
+
+def test_dates_are_sent_compactly():
+    fig = create_gantt_chart(make_tasks(['子專案', '里程碑']), '每月', '依專案區分顏色', RENDER_SVG)
+    bars = next(trace for trace in fig.data if trace.type == 'bar')
+    milestones = next(trace for trace in fig.data if trace.type == 'scatter')
+    # 長條起點為精簡日期字串，懸停提示直接格式化 base，不再重複傳送開始日期
+    assert list(bars.base) == ['2025-01-01']
+    assert np.asarray(bars.customdata).shape == (1, 2)
+    # 里程碑日期為 float64 毫秒數，以二進位型別陣列傳送；JSON 中不出現完整的 ISO 時間字串
+    assert milestones.x.dtype == np.float64 and milestones.x[0] == pd.Timestamp('2025-01-01').value // 10 ** 6
+    payload = pio.to_json(fig, validate=False)
+    assert '"bdata"' in payload and '2025-01-01T' not in payload
+
+
+@pytest.mark.parametrize("types, projects", [
+    (['里程碑', '里程碑'], None),     # 只有里程碑，沒有任務長條
+    (['子專案', '子專案'], [None, None]),  # 母專案皆為空白，沒有任何顏色群組
+])
+@pytest.mark.parametrize("color_mode", ['依專案區分顏色', '依進度狀態區分顏色'])
+def test_chart_without_color_groups(types, projects, color_mode):
+    fig = create_gantt_chart(make_tasks(types, projects), '每月', color_mode, RENDER_SVG)
+    pio.to_json(fig, validate=False)
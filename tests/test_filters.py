@@ -0,0 +1,41 @@
+"""
+篩選索引的回歸測試：結果須與直接以欄位比較的篩選相同。
+"""
+import numpy as np
+import pandas as pd
+
+from gantt_core import (
+    UNASSIGNED_PROJECT_LABEL, aggregate_projects, build_project_type_index, filter_positions, preprocess_data,
+)
+
+
+def test_parent_filter_keeps_rows_without_project():
+    df = preprocess_data(pd.DataFrame({
+        'Task': ['A', 'B', 'C', 'D'],
+        'Project': ['P1', None, 'P1', None],
+        'Type': ['母專案', '母專案', '子專案', '子專案'],
+        'Start': ['2025-01-01'] * 4,
+        'Finish': ['2025-01-31'] * 4,
+    }))
+    index = build_project_type_index(df)
+    positions = filter_positions(index, "只顯示母專案")
+    np.testing.assert_array_equal(positions, np.flatnonzero((df['Type'] == '母專案').to_numpy()))
+    # 空白專案不會出現在母專案的篩選選項中
+    assert index['parent_projects'] == ['P1']
+
+
+def test_aggregate_keeps_rows_without_project():
+    df = preprocess_data(pd.DataFrame({
+        'Task': ['A', 'B', 'C', 'D', 'E'],
+        'Project': ['P1', None, 'P2', None, 'P1'],
+        'Type': ['子專案'] * 5,
+        'Start': ['2025-01-01', '2025-02-01', '2025-01-01', '2025-03-01', '2025-01-10'],
+        'Finish': ['2025-01-31', '2025-02-15', '2025-01-31', '2025-03-31', '2025-01-20'],
+    }))
+    summary = aggregate_projects(df)
+    assert len(summary) == 3
+    blank = summary[summary['Project'].isna()].iloc[0]
+    assert blank['Task'] == f"{UNASSIGNED_PROJECT_LABEL} (彙總 2 項)"
+    assert (blank['Start'], blank['Finish']) == (pd.Timestamp('2025-02-01'), pd.Timestamp('2025-03-31'))
+    # 展開其他專案時，空白專案的列仍保留為彙總列
+    assert len(aggregate_projects(df, ['P1'])) == 4
@@ -0,0 +1,65 @@
+"""
+讀取路徑的回歸測試：各解析引擎與欄式格式讀出的資料須與 pandas 分塊讀取一致。
+"""
+import pandas as pd
+import pytest
+
+from gantt_core import ENGINE_ARROW, ENGINE_PANDAS, load_tasks, pa
+
+CODE_CSV = "Task,Project,Type,Start,Finish,Status\n0101,007,子專案,2025-01-01,2025-01-05,Closed\n".encode("utf-8")
+
+
+@pytest.mark.parametrize("engine", [ENGINE_PANDAS, ENGINE_ARROW])
+def test_numeric_looking_codes_stay_text(engine):
+    if engine == ENGINE_ARROW and pa is None:
+        pytest.skip("未安裝 pyarrow")
+    df = load_tasks(CODE_CSV, engine)
+    assert list(df['Task']) == ['0101']
+    assert list(df['Project']) == ['007']
+
+
+def write_columnar(df, file_format, keep_pandas_metadata):
+    """將資料表寫成指定的欄式格式位元組；可去除 pandas 的 schema metadata，模擬其他工具寫出的檔案。"""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if not keep_pandas_metadata:
+        table = table.replace_schema_metadata(None)
+    buffer = pa.BufferOutputStream()
+    if file_format == 'parquet':
+        import pyarrow.parquet as pq
+        pq.write_table(table, buffer)
+    elif file_format == 'feather':
+        import pyarrow.feather as pa_feather
+        pa_feather.write_feather(table, buffer)
+    else:
+        with pa.ipc.new_stream(buffer, table.schema) as writer:
+            writer.write_table(table)
+    return buffer.getvalue().to_pybytes()
+
+
+@pytest.mark.parametrize("keep_pandas_metadata", [True, False])
+@pytest.mark.parametrize("file_format", ['parquet', 'feather', 'arrow'])
+def test_timezone_aware_dates_keep_local_wall_time(file_format, keep_pandas_metadata):
+    if pa is None:
+        pytest.skip("未安裝 pyarrow")
+    local_dates = pd.to_datetime(['2025-03-01', '2025-03-05']).tz_localize('Asia/Taipei')
+    df = pd.DataFrame({
+        'Task': ['A', 'B'], 'Project': ['P', 'P'], 'Type': ['子專案', '里程碑'], 'Status': ['Closed', 'Not start'],
+        'Start': local_dates, 'Finish': local_dates,
+    })
+    loaded = load_tasks(write_columnar(df, file_format, keep_pandas_metadata), file_format=file_format)
+    assert loaded['Start'].dtype == 'datetime64[ns]'
+    assert sorted(loaded['Start']) == list(pd.to_datetime(['2025-03-01', '2025-03-05']))
+
+
+def test_compact_dates_match_across_engines():
+    if pa is None:
+        pytest.skip("未安裝 pyarrow")
+    csv = "Task,Project,Type,Start,Finish,Status\nA,P,子專案,20250101,20250105,Closed\nB,P,里程碑,20250210,20250210,Not start\n"
+    frames = [load_tasks(csv.encode("utf-8"), engine) for engine in (ENGINE_PANDAS, ENGINE_ARROW)]
+    for df in frames:
+        assert sorted(df['Start']) == list(pd.to_datetime(['2025-01-01', '2025-02-10']))
+        assert df.attrs['coerced_dates'].get('Start', 0) == 0
+    pd.testing.assert_series_equal(
+        frames[0].sort_values('Task')['Finish'].reset_index(drop=True),
+        frames[1].sort_values('Task')['Finish'].reset_index(drop=True),
+    )